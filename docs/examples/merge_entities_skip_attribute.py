@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import ClassVar, FrozenSet
 
 from repository_orm import Entity
 
@@ -7,7 +8,7 @@ class Author(Entity):
     name: str
     is_alive: bool = True
     birthday: datetime
-    _skip_on_merge = ["birthday"]
+    _skip_on_merge: ClassVar[FrozenSet[str]] = frozenset({"birthday"})
 
 
 author = Author(name="Brandon", birthday=datetime(2020, 1, 1))
@@ -1,14 +1,31 @@
 """Library to ease the implementation of the repository pattern in Python projects."""
 
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from .adapters.data.abstract import Repository
 from .adapters.data.fake import FakeRepository, FakeRepositoryDB
-from .adapters.data.pypika import PypikaRepository
-from .adapters.data.tinydb import TinyDBRepository
 from .adapters.file.local_file import LocalFileRepository
-from .exceptions import AutoIncrementError, EntityNotFoundError
+from .exceptions import (
+    AutoIncrementError,
+    EntityNotFoundError,
+    FileContentNotLoadedError,
+    TooManyEntitiesError,
+)
 from .model import Entity, EntityID, File
 from .services import load_file_repository, load_repository
 
+if TYPE_CHECKING:
+    from .adapters.data.pypika import PypikaRepository
+    from .adapters.data.tinydb import TinyDBRepository
+
+# The database backends are imported when they're first used, so users don't pay
+# the import of the libraries of the backends they don't use.
+_LAZY_REPOSITORIES = {
+    "PypikaRepository": ".adapters.data.pypika",
+    "TinyDBRepository": ".adapters.data.tinydb",
+}
+
 __all__ = [
     "AutoIncrementError",
     "Entity",
@@ -16,12 +33,25 @@ __all__ = [
     "EntityNotFoundError",
     "FakeRepository",
     "File",
+    "FileContentNotLoadedError",
     "FakeRepositoryDB",
     "LocalFileRepository",
     "PypikaRepository",
     "Repository",
     "Repository",
     "TinyDBRepository",
+    "TooManyEntitiesError",
     "load_repository",
     "load_file_repository",
 ]
+
+
+# ANN401: Any not allowed, but it's what we have.
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import the database backends on their first use."""
+    try:
+        module_name = _LAZY_REPOSITORIES[name]
+    except KeyError as error:
+        raise AttributeError(f"module {__name__} has no attribute {name}") from error
+
+    return getattr(import_module(module_name, __name__), name)
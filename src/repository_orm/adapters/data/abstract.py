@@ -5,9 +5,11 @@ import logging
 from contextlib import suppress
 from typing import Dict, List, Type, TypeVar
 
-from repository_orm.exceptions import TooManyEntitiesError
-
-from ...exceptions import AutoIncrementError, EntityNotFoundError
+from ...exceptions import (
+    AutoIncrementError,
+    EntityNotFoundError,
+    TooManyEntitiesError,
+)
 from ...model import Entity, EntityID, EntityOrEntitiesT, EntityT
 from .cache import Cache
 
@@ -1,19 +1,20 @@
 """Store the fake repository implementation."""
 
-import copy
 import re
 from contextlib import suppress
-from typing import Dict, List, Type
-
-from deepdiff import extract, grep
+from operator import attrgetter
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Set, Type
 
 from repository_orm import Repository
 
 from ...exceptions import EntityNotFoundError
-from ...model import EntityID, EntityT
+from ...model import Entity, EntityID, EntityT
 
 FakeRepositoryDB = Dict[Type[EntityT], Dict[EntityID, EntityT]]
 
+# Value of the attributes that the entities don't have.
+_MISSING = object()
+
 
 class FakeRepository(Repository):
     """Implement the repository pattern using a memory dictionary."""
@@ -30,6 +31,15 @@ class FakeRepository(Repository):
         # I don't know how to fix this
         self.entities: FakeRepositoryDB[EntityT] = {}  # type: ignore
         self.new_entities: FakeRepositoryDB[EntityT] = {}  # type: ignore
+        # Ids of the entities of each model staged to be deleted.
+        self._deleted: Dict[Type[Entity], Set[EntityID]] = {}
+        # Sorted entities of each model, they are invalidated when the entities of
+        # the model change.
+        self._sorted_entities: Dict[Type[Entity], List[Entity]] = {}
+        # Entities of each model indexed by the value of an attribute. They are
+        # built on the equality searches and invalidated when the entities of the
+        # model change.
+        self._indexes: Dict[Type[Entity], Dict[str, Dict[Any, List[Entity]]]] = {}
         self.is_connection_closed = False
 
     def _add(self, entity: EntityT) -> EntityT:
@@ -41,14 +51,9 @@ class FakeRepository(Repository):
         Returns:
             entity
         """
-        if self.new_entities == {}:
-            self.new_entities = copy.deepcopy(self.entities.copy())
-        try:
-            self.new_entities[type(entity)]
-        except KeyError:
-            self.new_entities[type(entity)] = {}
-
-        self.new_entities[type(entity)][entity.id_] = entity
+        self.new_entities.setdefault(type(entity), {})[entity.id_] = entity
+        with suppress(KeyError):
+            self._deleted[type(entity)].discard(entity.id_)
 
         return entity
 
@@ -61,14 +66,16 @@ class FakeRepository(Repository):
         Raises:
             EntityNotFoundError: If the entity is not found.
         """
-        if self.new_entities == {}:
-            self.new_entities = copy.deepcopy(self.entities.copy())
-        try:
-            self.new_entities[type(entity)].pop(entity.id_, None)
-        except KeyError as error:
+        model = type(entity)
+        staged_entity = self.new_entities.get(model, {}).pop(entity.id_, None)
+        if staged_entity is None and (
+            entity.id_ not in self.entities.get(model, {})
+            or entity.id_ in self._deleted.get(model, set())
+        ):
             raise EntityNotFoundError(
                 f"Unable to delete entity {entity} because it's not in the repository"
-            ) from error
+            )
+        self._deleted.setdefault(model, set()).add(entity.id_)
 
     def _get(
         self,
@@ -88,7 +95,7 @@ class FakeRepository(Repository):
         Returns:
             entities: All entities that match the criteria.
         """
-        matching_entities = []
+        matching_entities: List[EntityT] = []
 
         if attribute == "id_":
             with suppress(KeyError):
@@ -96,7 +103,8 @@ class FakeRepository(Repository):
         else:
             matching_entities = self._search({attribute: value}, model)
 
-        return copy.deepcopy(matching_entities)
+        # Pydantic's copy uses the model fields, so it's faster than copy.deepcopy
+        return [entity.copy(deep=True) for entity in matching_entities]
 
     def _all(self, model: Type[EntityT]) -> List[EntityT]:
         """Get all the entities from the repository that match a model.
@@ -106,20 +114,28 @@ class FakeRepository(Repository):
         Args:
             model: Entity class to obtain.
         """
-        entities = []
-
-        with suppress(KeyError):
-            entities += sorted(
-                entity for entity_id, entity in self.entities[model].items()
-            )
+        if model not in self._sorted_entities:
+            entities = self.entities.get(model, {}).values()
+            try:
+                self._sorted_entities[model] = sorted(entities, key=attrgetter("id_"))
+            except TypeError:
+                # Models with mixed int and str ids need the Entity comparison.
+                self._sorted_entities[model] = sorted(entities)
 
-        return entities
+        # ignore: the cache stores the entities of the model `model`
+        return list(self._sorted_entities[model])  # type: ignore
 
     def commit(self) -> None:
         """Persist the changes into the repository."""
         for model, entities in self.new_entities.items():
-            self.entities[model] = entities
+            self.entities.setdefault(model, {}).update(entities)
+            self._invalidate(model)
+        for model, entity_ids in self._deleted.items():
+            for entity_id in entity_ids:
+                self.entities.get(model, {}).pop(entity_id, None)
+            self._invalidate(model)
         self.new_entities = {}
+        self._deleted = {}
 
     def _search(
         self,
@@ -137,43 +153,65 @@ class FakeRepository(Repository):
         Returns:
             entities: List of Entity object that matches the search criteria.
         """
-        all_entities = self.all(model)
-        entities_dict = {entity.id_: entity for entity in all_entities}
-        entity_attributes = {entity.id_: entity.dict() for entity in all_entities}
-
+        regexps = {
+            key: re.compile(value, re.IGNORECASE)
+            for key, value in fields.items()
+            if isinstance(value, str)
+        }
+
+        # Equality searches can use an index of the attribute values to reduce the
+        # entities to check.
+        entities: List[EntityT] = []
         for key, value in fields.items():
-            # Get entities that have the value `value`
-            entities_with_value = entity_attributes | grep(
-                value, use_regexp=True, strict_checking=False
+            if not isinstance(value, str) and _is_hashable(value):
+                # ignore: the index stores the entities of the model `model`
+                entities = self._index(model, key).get(value, [])  # type: ignore
+                break
+        else:
+            # We use `_all` instead of `all` because the later adds all the
+            # entities to the cache, while we only need to cache the ones that
+            # match.
+            entities = self._all(model)
+
+        return [
+            entity
+            for entity in entities
+            if all(
+                _matches(getattr(entity, key, _MISSING), value, regexps.get(key))
+                for key, value in fields.items()
             )
-            matching_entity_attributes = {}
+        ]
 
-            try:
-                entities_with_value["matched_values"]
-            except KeyError:
-                return []
-
-            for path in entities_with_value["matched_values"]:
-                entity_id = re.sub(r"root\['?(.*?)'?\]\[.*", r"\1", path)
-
-                # Convert int ids from str to int
-                try:
-                    # ignore: waiting for ADR-006 to be resolved
-                    entity_id = int(entity_id)  # type: ignore
-                except ValueError:
-                    entity_id = re.sub(r"'(.*)'", r"\1", entity_id)
-
-                # Add the entity to the matching ones only if the value is of the
-                # attribute `key`.
-                if re.match(rf"root\['?{entity_id}'?\]\['{key}'\]", path):
-                    matching_entity_attributes[entity_id] = extract(
-                        entity_attributes, f"root[{entity_id}]"
-                    )
-            # ignore: waiting for ADR-006 to be resolved
-            entity_attributes = matching_entity_attributes  # type: ignore
-        entities = [entities_dict[key] for key in entity_attributes.keys()]
-
-        return entities
+    def _index(self, model: Type[Entity], attribute: str) -> Dict[Any, List[Entity]]:
+        """Return the entities of a model indexed by the value of an attribute.
+
+        If the attribute is a list, the entity is indexed by each of its elements.
+
+        Args:
+            model: Entity class to index.
+            attribute: Entity attribute to index.
+        """
+        with suppress(KeyError):
+            return self._indexes[model][attribute]
+
+        index: Dict[Any, List[Entity]] = {}
+        for entity in self.entities.get(model, {}).values():
+            value = getattr(entity, attribute, None)
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            for element in values:
+                if element is not None and _is_hashable(element):
+                    index.setdefault(element, []).append(entity)
+        self._indexes.setdefault(model, {})[attribute] = index
+        return index
+
+    def _invalidate(self, model: Type[Entity]) -> None:
+        """Remove the cached data of the entities of a model.
+
+        Args:
+            model: Entity class whose entities have changed.
+        """
+        self._sorted_entities.pop(model, None)
+        self._indexes.pop(model, None)
 
     def apply_migrations(self, migrations_directory: str) -> None:
         """Run the migrations of the repository schema.
@@ -199,32 +237,30 @@ class FakeRepository(Repository):
         Raises:
             EntityNotFoundError: If there are no entities.
         """
+        last_staged_entity = max(self._staged_entities(model), default=None)
         try:
             last_index_entity = super().last(model)
-        except EntityNotFoundError as empty_repo:
-            try:
-                # Empty repo but entities staged to be commited.
-                return max(self._staged_entities(model))
-            except KeyError as no_staged_entities:
+        except EntityNotFoundError:
+            if last_staged_entity is None:
                 # Empty repo and no entities staged.
-                raise empty_repo from no_staged_entities
+                raise
+            # Empty repo but entities staged to be commited.
+            return last_staged_entity
 
-        try:
-            last_staged_entity = max(self._staged_entities(model))
-        except KeyError:
+        if last_staged_entity is None:
             # Full repo and no staged entities.
             return last_index_entity
 
         # Full repo and staged entities.
-        return max([last_index_entity, last_staged_entity])
+        return max(last_index_entity, last_staged_entity)
 
-    def _staged_entities(self, model: Type[EntityT]) -> List[EntityT]:
-        """Return a list of staged entities of a model type.
+    def _staged_entities(self, model: Type[EntityT]) -> Iterator[EntityT]:
+        """Iterate over the staged entities of a model type.
 
         Args:
             model: Return only instances of this model.
         """
-        return [entity for _, entity in self.new_entities[model].items()]
+        yield from self.new_entities.get(model, {}).values()
 
     def close(self) -> None:
         """Close the connection to the database."""
@@ -239,3 +275,42 @@ class FakeRepository(Repository):
         """Remove all entities from the repository."""
         self.entities = {}
         self.new_entities = {}
+        self._deleted = {}
+        self._sorted_entities = {}
+        self._indexes = {}
+
+
+# ANN401: Any not allowed, but it's what we have.
+def _matches(
+    attribute: Any,  # noqa: ANN401
+    value: EntityID,
+    regexp: Optional[Pattern[str]],
+) -> bool:
+    """Check if the value of an entity attribute matches the searched value.
+
+    String values are used as case insensitive regular expressions, the rest of
+    values need to be equal. If the attribute is a list, it's enough that one of
+    the elements match.
+
+    Args:
+        attribute: Value of the entity attribute.
+        value: Searched value.
+        regexp: Compiled regular expression of the value if it's a string.
+    """
+    if attribute is _MISSING or attribute is None:
+        return False
+    if isinstance(attribute, (list, tuple, set)):
+        return any(_matches(element, value, regexp) for element in attribute)
+    if regexp is not None:
+        return regexp.search(str(attribute)) is not None
+    return bool(attribute == value)
+
+
+# ANN401: Any not allowed, but it's what we have.
+def _is_hashable(value: Any) -> bool:  # noqa: ANN401
+    """Check if a value can be used as a dictionary key."""
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
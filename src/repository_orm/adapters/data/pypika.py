@@ -1,13 +1,28 @@
 """Define the Pypika Repository."""
 
+import datetime
 import logging
 import os
 import re
 import sqlite3
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
 from sqlite3 import ProgrammingError
-from typing import Dict, List, Type, Union
-
-from pypika import Query, Table, functions
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+from uuid import UUID
+
+from pypika import Query, Table
 from yoyo import get_backend, read_migrations
 
 from ...exceptions import EntityNotFoundError
@@ -16,19 +31,101 @@ from .abstract import Repository
 
 log = logging.getLogger(__name__)
 
+_SQLITE_URL_RE = re.compile(r"^sqlite://")
+_PRIVATE_TABLE_RE = re.compile(r"^_")
+_YOYO_TABLE_RE = re.compile(r"^yoyo")
+# Characters with special meaning in regular expressions or LIKE patterns.
+_NOT_LITERAL_RE = re.compile(r"[.^$*+?{}\[\]\\|()%_]")
+
+
+def _adapt_value(value: Any) -> Any:
+    """Convert a python value into the format stored in the database.
+
+    The values are stored as pypika renders them in the queries: enums by their
+    value, dates in ISO format, and UUIDs and decimals as strings. The rest of
+    values are supported by sqlite.
+
+    Args:
+        value: value to convert.
+    """
+    if isinstance(value, Enum):
+        return _adapt_value(value.value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return value
+
+
+# ANN401: Any not allowed, but it's what we have.
+def _is_bindable(value: Any) -> bool:  # noqa: ANN401
+    """Check if sqlite can store a value passed as a statement parameter.
+
+    Args:
+        value: value to check.
+    """
+    return (
+        value is None
+        or isinstance(value, (int, float, str, bytes, bytearray, memoryview))
+        or (type(value), sqlite3.PrepareProtocol) in sqlite3.adapters
+        or hasattr(value, "__conform__")
+    )
+
+
+def _regexp_to_like(expression: str) -> Optional[str]:
+    """Translate a regular expression into an equivalent LIKE pattern.
+
+    Only literal ASCII expressions, optionally anchored with `^` or `$` or
+    surrounded by `.*`, can be translated, as LIKE is only case insensitive for
+    ASCII characters.
+
+    Args:
+        expression: regular expression to translate.
+
+    Returns:
+        The LIKE pattern or None if the expression can't be translated.
+    """
+    starts_anchored = expression.startswith("^")
+    if starts_anchored:
+        expression = expression[1:]
+    ends_anchored = expression.endswith("$")
+    if ends_anchored:
+        expression = expression[:-1]
+    if expression.startswith(".*"):
+        expression = expression[2:]
+        starts_anchored = False
+    if expression.endswith(".*"):
+        expression = expression[:-2]
+        ends_anchored = False
+
+    if not expression.isascii() or _NOT_LITERAL_RE.search(expression):
+        return None
+
+    return f"{'' if starts_anchored else '%'}{expression}{'' if ends_anchored else '%'}"
 
-def _regexp(expression: str, item: str) -> bool:
+
+@lru_cache(maxsize=256)
+def _compile(expression: str) -> Pattern[str]:
+    """Compile a regular expression, reusing the previous compilations."""
+    return re.compile(expression)
+
+
+def _regexp(expression: str, item: Optional[str]) -> bool:
     """Implement the REGEXP filter for SQLite.
 
+    SQLite calls the function once per row, so the regular expression compilation
+    is cached.
+
     Args:
         expression: regular expression to check.
-        item: element to check.
+        item: element to check, it's None if the column value is NULL.
 
     Returns:
         if the item matches the regular expression.
     """
-    reg = re.compile(expression)
-    return reg.search(item) is not None
+    if item is None:
+        return False
+    return _compile(expression).search(item) is not None
 
 
 class PypikaRepository(Repository):
@@ -53,17 +150,80 @@ class PypikaRepository(Repository):
                 raise ConnectionError(
                     f"Could not create the database file: {database_file}"
                 ) from error
-        self.connection = sqlite3.connect(database_file)
-        self.connection.create_function("REGEXP", 2, _regexp)
+        # The transactions are managed by us: a write opens one, and it's kept open
+        # until the commit, so all the changes are flushed to disk at once.
+        self.connection = sqlite3.connect(database_file, isolation_level=None)
+        try:
+            # A deterministic function lets SQLite reuse its result for the same
+            # arguments inside a statement.
+            self.connection.create_function("REGEXP", 2, _regexp, deterministic=True)
+        except (TypeError, sqlite3.NotSupportedError):
+            # The deterministic flag needs python >= 3.8 and sqlite >= 3.8.3.
+            self.connection.create_function("REGEXP", 2, _regexp)
         self.cursor = self.connection.cursor()
-
-    def _execute(self, query: Union[Query, str]) -> sqlite3.Cursor:
+        self.cursor.execute("PRAGMA journal_mode=WAL")
+        self.cursor.execute("PRAGMA synchronous=NORMAL")
+        self.cursor.execute("PRAGMA temp_store=MEMORY")
+        # SQL statements of the hot paths indexed by table and statement type.
+        self._query_cache: Dict[Tuple[str, str], str] = {}
+        # Upsert SQL statements indexed by table and entity attributes.
+        self._upsert_cache: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+        # Rows of the added entities that haven't been written to the database yet,
+        # indexed by table and id. They are written in batches before any other
+        # statement is run.
+        self._staged_rows: Dict[Tuple[str, Any], Tuple[Tuple[str, ...], List[Any]]] = {}
+
+    def _execute(
+        self, query: Union[Query, str], parameters: Sequence[Any] = ()
+    ) -> sqlite3.Cursor:
         """Execute an SQL statement from a Pypika query object.
 
         Args:
-            query: Pypika query
+            query: Pypika query or SQL statement.
+            parameters: Values of the placeholders of the statement.
+        """
+        return self.cursor.execute(str(query), parameters)
+
+    def _select_query(self, model: Type[EntityT], column: Optional[str] = None) -> str:
+        """Return the SQL statement that selects the entities of a model.
+
+        The statements are cached as their shape only depends on the table and the
+        filtered column.
+
+        Args:
+            model: Entity class to obtain.
+            column: If set, filter the entities whose column is equal to the value
+                of the placeholder.
+        """
+        table = self._table_model(model).get_table_name()
+        key = (table, "SELECT" if column is None else f"SELECT {column}")
+        try:
+            return self._query_cache[key]
+        except KeyError:
+            # nosec: B608:hardcoded_sql_expressions, the table and column names are
+            #   defined by the developer in the models, the values are passed as
+            #   parameters.
+            query = f'SELECT * FROM "{table}"'  # nosec
+            if column is not None:
+                query += f' WHERE "{column}" = ?'
+            self._query_cache[key] = query
+            return query
+
+    def _delete_query(self, table: str) -> str:
+        """Return the SQL statement that deletes an entity by its id.
+
+        Args:
+            table: Name of the table of the entity.
         """
-        return self.cursor.execute(str(query))
+        key = (table, "DELETE")
+        try:
+            return self._query_cache[key]
+        except KeyError:
+            # nosec: B608:hardcoded_sql_expressions, the table name is defined by the
+            #   developer in the models, the id is passed as a parameter.
+            query = f'DELETE FROM "{table}" WHERE "id" = ?'  # nosec
+            self._query_cache[key] = query
+            return query
 
     @staticmethod
     def _table(entity: EntityT) -> Table:
@@ -86,28 +246,95 @@ class PypikaRepository(Repository):
         Returns:
             entity
         """
-        table = self._table(entity)
-        columns = list(entity.dict().keys())
-        columns[columns.index("id_")] = "id"
-        values = [value for key, value in entity.dict().items()]
-        insert_query = Query.into(table).columns(tuple(columns)).insert(tuple(values))
-        # Until https://github.com/kayak/pypika/issues/535 is solved we need to write
-        # The upsert statement ourselves.
-        # nosec: B608:hardcoded_sql_expressions, Possible SQL injection vector through
-        #   string-based query construction. We're not letting the user define the
-        #   values of the query, the only variable inputs are the keys, that are
-        #   defined by the developer, so it's not probable that he chooses an
-        #   entity attributes that are an SQL injection. Once the #535 issue is
-        #   solved, we should get rid of this error too.
-        upsert_query = (
-            str(insert_query)
-            + " ON CONFLICT(id) DO UPDATE SET "  # nosec
-            + ", ".join([f"{key}=excluded.{key}" for key in columns])
-        )
-        self._execute(upsert_query)
+        entity_data = entity.dict()
+        row = []
+        for attribute, value in entity_data.items():
+            value = _adapt_value(value)
+            # The rows are written on the next flush, check them now so that the
+            # errors are raised when the entity is added.
+            if not _is_bindable(value):
+                raise ProgrammingError(
+                    f"Error adding the attribute {attribute} of the "
+                    f"{entity.model_name} entity {entity.id_}: "
+                    f"type '{type(value).__name__}' is not supported"
+                )
+            row.append(value)
+
+        key = (self._table(entity).get_table_name(), _adapt_value(entity.id_))
+        # The last version of the entity is the one to write.
+        self._staged_rows.pop(key, None)
+        self._staged_rows[key] = (tuple(entity_data.keys()), row)
 
         return entity
 
+    def _begin(self) -> None:
+        """Open a transaction if there isn't one already open."""
+        if not self.connection.in_transaction:
+            self.cursor.execute("BEGIN")
+
+    def _flush(self) -> None:
+        """Write the staged entities to the database.
+
+        The rows that share table and attributes are written with a single
+        statement.
+        """
+        if not self._staged_rows:
+            return
+
+        batches: Dict[Tuple[str, Tuple[str, ...]], List[List[Any]]] = {}
+        for (table, _), (attributes, row) in self._staged_rows.items():
+            batches.setdefault((table, attributes), []).append(row)
+
+        self._begin()
+        # The batches are written inside a savepoint so that if one of them fails,
+        # the ones already written are undone without losing the rest of the changes
+        # of the transaction. The staged rows are kept until all of them are written.
+        self.cursor.execute("SAVEPOINT flush")
+        try:
+            for (table, attributes), rows in batches.items():
+                self.cursor.executemany(self._upsert_query(table, attributes), rows)
+        except sqlite3.Error:
+            self.cursor.execute("ROLLBACK TO flush")
+            raise
+        finally:
+            self.cursor.execute("RELEASE flush")
+        self._staged_rows = {}
+
+    def _upsert_query(self, table: str, attributes: Tuple[str, ...]) -> str:
+        """Return the SQL statement that inserts or updates an entity.
+
+        The statements are cached as their shape only depends on the table and the
+        entity attributes.
+
+        Args:
+            table: Name of the table of the entity.
+            attributes: Names of the entity attributes.
+        """
+        key = (table, attributes)
+        try:
+            return self._upsert_cache[key]
+        except KeyError:
+            columns = [
+                "id" if attribute == "id_" else attribute for attribute in attributes
+            ]
+            quoted_columns = ", ".join(f'"{column}"' for column in columns)
+            placeholders = ", ".join("?" for _ in columns)
+            updates = ", ".join(f'"{column}"=excluded."{column}"' for column in columns)
+            # Until https://github.com/kayak/pypika/issues/535 is solved we need to
+            # write the upsert statement ourselves.
+            # nosec: B608:hardcoded_sql_expressions, Possible SQL injection vector
+            #   through string-based query construction. The values are passed as
+            #   parameters, the only variable inputs are the table and the keys,
+            #   that are defined by the developer, so it's not probable that he
+            #   chooses an entity attributes that are an SQL injection.
+            query = (
+                f'INSERT INTO "{table}" ({quoted_columns}) '  # nosec
+                f"VALUES ({placeholders}) "
+                f"ON CONFLICT(id) DO UPDATE SET {updates}"
+            )
+            self._upsert_cache[key] = query
+            return query
+
     def delete(self, entity: EntityT) -> None:
         """Delete an entity from the repository.
 
@@ -117,15 +344,16 @@ class PypikaRepository(Repository):
         Raises:
             EntityNotFoundError: If the entity is not found.
         """
-        table = self._table(entity)
-        try:
-            self.get(entity.id_, type(entity))
-        except EntityNotFoundError as error:
+        self._flush()
+        self._begin()
+        cursor = self._execute(
+            self._delete_query(self._table(entity).get_table_name()),
+            (_adapt_value(entity.id_),),
+        )
+        if cursor.rowcount == 0:
             raise EntityNotFoundError(
                 f"Unable to delete entity {entity} because it's not in the repository"
-            ) from error
-        query = Query.from_(table).delete().where(table.id == entity.id_)
-        self._execute(query)
+            )
 
     def _get(
         self,
@@ -145,14 +373,11 @@ class PypikaRepository(Repository):
         Returns:
             entities: All entities that match the criteria.
         """
-        table = self._table_model(model)
-        query = Query.from_(table).select("*")
         if attribute == "id_":
-            query = query.where(table.id == value)
-        else:
-            query = query.where(getattr(table, attribute) == value)
+            attribute = "id"
+        query = self._select_query(model, attribute)
 
-        return self._build_entities(model, query)
+        return self._build_entities(model, query, (_adapt_value(value),))
 
     def _all(self, model: Type[EntityT]) -> List[EntityT]:
         """Get all the entities from the repository that match a model.
@@ -162,35 +387,36 @@ class PypikaRepository(Repository):
         Args:
             model: Entity class to obtain.
         """
-        table = self._table_model(model)
-        query = Query.from_(table).select("*")
-        return self._build_entities(model, query)
+        return self._build_entities(model, self._select_query(model))
 
-    def _build_entities(self, model: Type[EntityT], query: Query) -> List[EntityT]:
+    def _build_entities(
+        self,
+        model: Type[EntityT],
+        query: Union[Query, str],
+        parameters: Sequence[Any] = (),
+    ) -> List[EntityT]:
         """Build Entity objects from the data extracted from the database.
 
         Args:
             model: Entity class model to build.
-            query: pypika query of the entities you want to build
+            query: pypika query or SQL statement of the entities you want to build
+            parameters: Values of the placeholders of the statement.
         """
-        cursor = self._execute(query)
+        self._flush()
+        cursor = self._execute(query, parameters)
 
-        entities_data = cursor.fetchall()
-        attributes = [description[0] for description in cursor.description]
-
-        entities = []
-        for entity_data in entities_data:
-            entity_dict = {
-                attributes[index]: entity_data[index]
-                for index in range(0, len(entity_data))
-            }
-            entity_dict["id_"] = entity_dict.pop("id")
+        attributes = [
+            "id_" if description[0] == "id" else description[0]
+            for description in cursor.description
+        ]
 
-            entities.append(model(**entity_dict))
-        return entities
+        # Iterate the cursor instead of using fetchall to avoid keeping all the rows
+        # in memory while the entities are built.
+        return [model(**dict(zip(attributes, entity_data))) for entity_data in cursor]
 
     def commit(self) -> None:
         """Persist the changes into the repository."""
+        self._flush()
         self.connection.commit()
 
     def _search(
@@ -209,20 +435,30 @@ class PypikaRepository(Repository):
         Returns:
             entities: List of Entity object that matches the search criteria.
         """
-        table = self._table_model(model)
-        query = Query.from_(table).select("*")
-
+        conditions = []
+        parameters: List[Any] = []
         for key, value in fields.items():
-            if key == "id_":
-                key = "id"
+            column = "id" if key == "id_" else key
             if isinstance(value, str):
-                query = query.where(
-                    functions.Lower(getattr(table, key)).regexp(value.lower())
-                )
+                like_pattern = _regexp_to_like(value)
+                if like_pattern is not None:
+                    # LIKE is evaluated by SQLite, and it's case insensitive.
+                    conditions.append(f'"{column}" LIKE ?')
+                    parameters.append(like_pattern)
+                else:
+                    conditions.append(f'lower("{column}") REGEXP ?')
+                    parameters.append(value.lower())
             else:
-                query = query.where(getattr(table, key) == value)
+                conditions.append(f'"{column}" = ?')
+                parameters.append(_adapt_value(value))
 
-        return self._build_entities(model, query)
+        # The values are passed as parameters, so the statements of the searches
+        # with the same shape are reused by the sqlite statement cache.
+        query = self._select_query(model)
+        if conditions:
+            query += f" WHERE {' AND '.join(conditions)}"
+
+        return self._build_entities(model, query, parameters)
 
     def apply_migrations(self, migrations_directory: str) -> None:
         """Run the migrations of the repository schema.
@@ -256,24 +492,38 @@ class PypikaRepository(Repository):
             log.debug("Complete running database migrations")
 
     def close(self) -> None:
-        """Close the connection to the database."""
+        """Close the connection to the database.
+
+        The entities that weren't committed are discarded.
+        """
+        self._staged_rows = {}
         self.connection.close()
 
     def empty(self) -> None:
-        """Remove all entities from the repository."""
-        for table in self.tables:
-            self._execute(Query.from_(table).delete())
+        """Remove all entities from the repository.
+
+        All the tables are emptied with a single script inside one transaction, the
+        changes are persisted once the script ends.
+        """
+        self._staged_rows = {}
+        # nosec: B608:hardcoded_sql_expressions, the table names are read from the
+        #   database schema, not from the user.
+        statements = "".join(
+            f'DELETE FROM "{table}";' for table in self.tables  # nosec
+        )
+        self.cursor.executescript(f"BEGIN IMMEDIATE;{statements}COMMIT;")
 
     @property
     def tables(self) -> List[str]:
         """Return the entity tables of the database."""
-        if re.match("sqlite://", self.database_url):
+        if _SQLITE_URL_RE.match(self.database_url):
             query = "SELECT name FROM sqlite_master WHERE type='table'"
 
         tables = [
             table[0]
             for table in self._execute(query).fetchall()
-            if not re.match(r"^_", table[0]) and not re.match("yoyo", table[0])
+            if not _PRIVATE_TABLE_RE.match(table[0])
+            and not _YOYO_TABLE_RE.match(table[0])
         ]
         return tables
 
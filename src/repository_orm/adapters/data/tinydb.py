@@ -1,38 +1,88 @@
 """Define the TinyDB Repository."""
 
 import logging
+import operator
 import os
 import re
 from contextlib import suppress
-from typing import Any, Dict, Iterable, List, Optional, Type
+from functools import lru_cache, reduce
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Type, Union
 
 from pydantic import ValidationError
 from tinydb import Query, TinyDB
+from tinydb.middlewares import CachingMiddleware
 from tinydb.queries import QueryInstance
 from tinydb.storages import JSONStorage
+from tinydb.table import Document
 from tinydb_serialization import SerializationMiddleware
 from tinydb_serialization.serializers import DateTimeSerializer
 
 from ...exceptions import EntityNotFoundError
-from ...model import EntityID, EntityT
+from ...model import Entity, EntityID, EntityT
 from .abstract import Repository
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
 log = logging.getLogger(__name__)
 
 
+class _OrjsonStorage(JSONStorage):
+    """Store the data in a JSON file using orjson to parse and dump it.
+
+    It's used instead of TinyDB's JSONStorage if the orjson extra is installed.
+    """
+
+    # ANN401: Any not allowed, but it's what we have.
+    def __init__(self, path: str, **kwargs: Any) -> None:  # noqa: ANN401
+        """Open the database file, orjson dumps the data encoded in UTF-8."""
+        kwargs.setdefault("encoding", "utf-8")
+        super().__init__(path, **kwargs)
+
+    def read(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Read the data of the database file."""
+        self._handle.seek(0, os.SEEK_END)
+        if not self._handle.tell():
+            return None
+        self._handle.seek(0)
+        return orjson.loads(self._handle.read())
+
+    def write(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """Write the data to the database file."""
+        self._handle.seek(0)
+        self._handle.write(
+            orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        )
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self._handle.truncate()
+
+
 class TinyDBRepository(Repository):
-    """Implement the repository pattern using the TinyDB."""
+    """Implement the repository pattern using the TinyDB.
+
+    Attributes:
+        database_url: URL specifying the connection to the database.
+        trusted_load: Skip the pydantic validation when building the entities from
+            the data stored in the database.
+    """
 
     def __init__(
         self,
         database_url: str = "",
+        trusted_load: bool = False,
     ) -> None:
         """Initialize the repository attributes.
 
         Args:
             database_url: URL specifying the connection to the database.
+            trusted_load: Skip the pydantic validation when building the entities
+                from the data stored in the database.
         """
         super().__init__(database_url)
+        self.trusted_load = trusted_load
         self.database_file = os.path.expanduser(database_url.replace("tinydb://", ""))
         if not os.path.isfile(self.database_file):
             try:
@@ -43,13 +93,22 @@ class TinyDBRepository(Repository):
                     f"Could not create the database file: {self.database_file}"
                 ) from error
 
-        serialization = SerializationMiddleware(JSONStorage)
+        serialization = SerializationMiddleware(
+            JSONStorage if orjson is None else _OrjsonStorage
+        )
         serialization.register_serializer(DateTimeSerializer(), "TinyDate")
 
-        self.db_ = TinyDB(
-            self.database_file, storage=serialization, sort_keys=True, indent=4
-        )
-        self.staged: Dict[str, List[Any]] = {"add": [], "remove": []}
+        # The writes are kept in memory until the changes are committed, and the
+        # database file is only read again after a commit.
+        # ignore: the TinyDB middlewares aren't typed.
+        self.storage = CachingMiddleware(serialization)  # type: ignore
+        self.db_ = TinyDB(self.database_file, storage=self.storage)
+        self.is_connection_closed = False
+        self.staged: Dict[str, List[Entity]] = {"add": [], "remove": []}
+        # Biggest staged entity of each model, used by `last`.
+        self._staged_max: Dict[Type[Entity], Entity] = {}
+        # Document ids of the entities indexed by model type and entity id.
+        self._id_index: Dict[str, Dict[EntityID, int]] = {}
 
     def _add(self, entity: EntityT) -> EntityT:
         """Append an entity to the repository.
@@ -63,6 +122,9 @@ class TinyDBRepository(Repository):
             entity
         """
         self.staged["add"].append(entity)
+        staged_max = self._staged_max.get(type(entity))
+        if staged_max is None or staged_max < entity:
+            self._staged_max[type(entity)] = entity
 
         return entity
 
@@ -71,13 +133,18 @@ class TinyDBRepository(Repository):
 
         Args:
             entity: Entity to remove from the repository.
+
+        Raises:
+            EntityNotFoundError: If the entity is not found.
         """
-        try:
-            self.get(entity.id_, type(entity))
-        except EntityNotFoundError as error:
+        # We only need to know if the entity exists, so there is no need to build
+        # it as `get` does.
+        if not self.db_.contains(
+            (Query().id_ == entity.id_) & _model_query(type(entity))
+        ):
             raise EntityNotFoundError(
                 f"Unable to delete entity {entity} because it's not in the repository"
-            ) from error
+            )
         self.staged["remove"].append(entity)
 
     def _get(
@@ -98,24 +165,40 @@ class TinyDBRepository(Repository):
         Returns:
             entities: All entities that match the criteria.
         """
-        model_query = Query().model_type_ == model.__name__.lower()
+        model_type = _model_key(model)
+        if attribute == "id_":
+            with suppress(KeyError, TypeError):
+                entity_data = self.db_.get(doc_id=self._id_index[model_type][value])
+                # The index may be outdated if the database was changed by other
+                # means, so we check that the document is the one we want.
+                if (
+                    isinstance(entity_data, Document)
+                    and entity_data.get("model_type_") == model_type
+                    and entity_data.get("id_") == value
+                ):
+                    return [self._build_entity(entity_data, model)]
 
         matching_entities_data = self.db_.search(
-            (Query()[attribute] == value) & (model_query)
+            (Query()[attribute] == value) & _model_query(model)
         )
+        if attribute == "id_":
+            self._index_documents(model_type, matching_entities_data)
 
         return [
             self._build_entity(entity_data, model)
             for entity_data in matching_entities_data
         ]
 
-    @staticmethod
     def _build_entity(
+        self,
         entity_data: Dict[Any, Any],
         model: Type[EntityT],
     ) -> EntityT:
         """Create an entity from the data stored in a row of the database.
 
+        If `trusted_load` is set, the entity is built without running the pydantic
+        validations.
+
         Args:
             entity_data: Dictionary with the attributes of the entity.
             model: Type of entity object to obtain.
@@ -123,10 +206,16 @@ class TinyDBRepository(Repository):
         Returns:
             entity: Built Entity.
         """
-        # If we don't copy the data, the all method stop being idempotent.
-        entity_data = entity_data.copy()
+        # The document is not modified, so there is no need to copy it, we only
+        # build the attributes of the entity without the TinyDB ones.
+        attributes = {
+            key: value for key, value in entity_data.items() if key != "model_type_"
+        }
+        if self.trusted_load:
+            return model.construct(**attributes)
+
         try:
-            return model.parse_obj(entity_data)
+            return model.parse_obj(attributes)
         except ValidationError as error:
             log.error(
                 f"Error loading the model {model.__name__} "
@@ -144,14 +233,28 @@ class TinyDBRepository(Repository):
         """
         entities = []
 
-        query = Query().model_type_ == model.__name__.lower()
+        model_type = _model_key(model)
+        query = _model_query(model)
         entities_data = self.db_.search(query)
+        self._index_documents(model_type, entities_data)
 
         for entity_data in entities_data:
             entities.append(self._build_entity(entity_data, model))
 
         return entities
 
+    def _index_documents(self, model_type: str, documents: List[Document]) -> None:
+        """Store the document ids of the entities in the id index.
+
+        Args:
+            model_type: Model type of the documents.
+            documents: TinyDB documents of the entities.
+        """
+        index = self._id_index.setdefault(model_type, {})
+        for document in documents:
+            with suppress(KeyError, TypeError):
+                index[document["id_"]] = document.doc_id
+
     @staticmethod
     def _export_entity(entity: EntityT) -> Dict[Any, Any]:
         """Export the attributes of the entity appending the required by TinyDB.
@@ -163,27 +266,40 @@ class TinyDBRepository(Repository):
             entity_data: Dictionary with the attributes of the entity.
         """
         entity_data = entity.dict()
-        entity_data["model_type_"] = entity.model_name.lower()
+        entity_data["model_type_"] = _model_key(type(entity))
 
         return entity_data
 
     def commit(self) -> None:
         """Persist the changes into the repository."""
         for entity in self.staged["add"]:
-            self.db_.upsert(
+            model_type = _model_key(type(entity))
+            document_ids = self.db_.upsert(
                 self._export_entity(entity),
-                (Query().model_type_ == entity.model_name.lower())
-                & (Query().id_ == entity.id_),
+                _model_query(type(entity)) & (Query().id_ == entity.id_),
             )
+            self._id_index.setdefault(model_type, {})[entity.id_] = document_ids[0]
         self.staged["add"].clear()
+        self._staged_max = {}
 
         for entity in self.staged["remove"]:
-            self.db_.remove(
-                (Query().model_type_ == entity.model_name.lower())
-                & (Query().id_ == entity.id_)
-            )
+            model_type = _model_key(type(entity))
+            self.db_.remove(_model_query(type(entity)) & (Query().id_ == entity.id_))
+            self._id_index.get(model_type, {}).pop(entity.id_, None)
         self.staged["remove"].clear()
 
+        self._flush()
+
+    def _flush(self) -> None:
+        """Write the cached changes to the database file.
+
+        The read cache is dropped too, so the next read sees the changes done to
+        the file by other means.
+        """
+        # ignore: the TinyDB middlewares aren't typed.
+        self.storage.flush()  # type: ignore
+        self.storage.cache = None
+
     def _search(
         self,
         fields: Dict[str, EntityID],
@@ -231,8 +347,9 @@ class TinyDBRepository(Repository):
             Query based on the type of model and fields.
         """
         query_parts = []
+        model_query = _model_query(model)
 
-        schema = model.schema()["properties"]
+        schema = _schema_properties(model)
         for field, value in fields.items():
             if field not in schema.keys():
                 continue
@@ -240,21 +357,17 @@ class TinyDBRepository(Repository):
             with suppress(KeyError):
                 if schema[field]["type"] == "array":
                     query_parts.append(
-                        (Query().model_type_ == model.__name__.lower())
-                        & (Query()[field].test(_regexp_in_list, value))
+                        model_query
+                        & (Query()[field].test(_regexp_in_list, _compile(str(value))))
                     )
                     continue
 
             if isinstance(value, str):
                 query_parts.append(
-                    (Query().model_type_ == model.__name__.lower())
-                    & (Query()[field].search(value, flags=re.IGNORECASE))
+                    model_query & (Query()[field].search(value, flags=re.IGNORECASE))
                 )
             else:
-                query_parts.append(
-                    (Query().model_type_ == model.__name__.lower())
-                    & (Query()[field] == value)
-                )
+                query_parts.append(model_query & (Query()[field] == value))
         if len(query_parts) != 0:
             return self._merge_query(query_parts, mode="and")
 
@@ -276,15 +389,9 @@ class TinyDBRepository(Repository):
         Returns:
             A query object that joins all parts.
         """
-        query = query_parts[0]
+        join = operator.and_ if mode == "and" else operator.or_
 
-        for query_part in query_parts[1:]:
-            if mode == "and":
-                query = query & query_part
-            else:
-                query = query | query_part
-
-        return query
+        return reduce(join, query_parts)
 
     def apply_migrations(self, migrations_directory: str) -> None:
         """Run the migrations of the repository schema.
@@ -310,52 +417,85 @@ class TinyDBRepository(Repository):
         Raises:
             EntityNotFoundError: If there are no entities.
         """
+        # ignore: the staged entities of the model `model` are of type EntityT
+        staged_max: Dict[Type[EntityT], EntityT] = self._staged_max  # type: ignore
+        last_staged_entity = staged_max.get(model)
         try:
             last_index_entity = super().last(model)
-        except EntityNotFoundError as empty_repo:
-            try:
-                # Empty repo but entities staged to be commited.
-                return max(
-                    entity for entity in self.staged["add"] if entity.__class__ == model
-                )
-            except ValueError as no_staged_entities:
+        except EntityNotFoundError:
+            if last_staged_entity is None:
                 # Empty repo and no entities staged.
-                raise empty_repo from no_staged_entities
+                raise
+            # Empty repo but entities staged to be commited.
+            return last_staged_entity
 
-        try:
-            last_staged_entity = max(
-                entity for entity in self.staged["add"] if entity.__class__ == model
-            )
-        except ValueError:
+        if last_staged_entity is None:
             # Full repo and no staged entities.
             return last_index_entity
 
         # Full repo and staged entities.
-        return max([last_index_entity, last_staged_entity])
+        return max(last_index_entity, last_staged_entity)
 
     def close(self) -> None:
         """Close the connection to the database."""
         self.db_.close()
+        self.is_connection_closed = True
 
     @property
     def is_closed(self) -> bool:
         """Inform if the connection is closed."""
-        try:
-            self.db_.tables()
-            return False
-        except ValueError:
-            return True
+        # The storage cache can still answer the reads once the file is closed, so
+        # we can't rely on TinyDB raising an error.
+        return self.is_connection_closed
 
     def empty(self) -> None:
         """Remove all entities from the repository."""
         self.db_.truncate()
+        self._flush()
+        self._id_index = {}
+
+
+@lru_cache(maxsize=None)
+def _model_key(model: Type[Entity]) -> str:
+    """Return the value of the model_type_ attribute of the entities of a model."""
+    return model.__name__.lower()
+
+
+@lru_cache(maxsize=None)
+def _model_query(model: Type[Entity]) -> QueryInstance:
+    """Return the query that selects the entities of a model.
+
+    The queries are immutable, so they can be shared by all the searches.
+    """
+    return Query().model_type_ == _model_key(model)
+
+
+@lru_cache(maxsize=None)
+def _schema_properties(model: Type[Entity]) -> Dict[str, Any]:
+    """Return the JSON schema of the attributes of a model.
+
+    Building the schema is expensive and it doesn't change once the model is
+    defined. The returned dictionary is shared, so don't modify it.
+    """
+    return model.schema()["properties"]
+
+
+@lru_cache(maxsize=256)
+def _compile(regular_expression: str) -> Pattern[str]:
+    """Compile a regular expression, reusing the previous compilations."""
+    return re.compile(regular_expression)
 
 
-def _regexp_in_list(list_: Optional[Iterable[Any]], regular_expression: str) -> bool:
-    """Test if regexp matches any element of the list."""
+def _regexp_in_list(
+    list_: Optional[Iterable[Any]], regular_expression: Union[str, Pattern[str]]
+) -> bool:
+    """Test if regexp matches any string element of the list."""
     if list_ is None:
         return False
 
-    regexp = re.compile(regular_expression)
+    if isinstance(regular_expression, str):
+        regexp = _compile(regular_expression)
+    else:
+        regexp = regular_expression
 
-    return any(regexp.search(element) for element in list_)
+    return any(regexp.search(element) for element in list_ if isinstance(element, str))
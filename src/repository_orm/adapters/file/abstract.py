@@ -1,7 +1,7 @@
 """Define the abstract interface for file repositories."""
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, AnyStr, Generic
+from typing import TYPE_CHECKING, AnyStr, BinaryIO, Generic
 
 from pydantic import BaseModel  # noqa: E0611
 
@@ -24,13 +24,34 @@ class FileRepository(BaseModel, ABC, Generic[AnyStr]):
         """Save the content of the file into the persistence system."""
         raise NotImplementedError
 
+    @abstractmethod
+    def stream_load(self, file_: "File[AnyStr]", destination: BinaryIO) -> None:
+        """Copy the content of the file into a binary file object.
+
+        The content is not loaded into the File object, so it can be used with files
+        that don't fit in memory.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_save(self, file_: "File[AnyStr]", source: BinaryIO) -> "File[AnyStr]":
+        """Save the content of a binary file object into the persistence system.
+
+        The content is not loaded into the File object, so it can be used with files
+        that don't fit in memory.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def delete(self, file_: "File[AnyStr]") -> None:
         """Delete the file from the persistence system."""
         raise NotImplementedError
 
     def fix_path(self, file_: "File[AnyStr]") -> "File[AnyStr]":
-        """Update the path to include the workdir."""
-        if self.workdir not in file_.path:
+        """Update the path to include the workdir.
+
+        The path is only updated if it doesn't start with the workdir.
+        """
+        if not file_.path.startswith(f"{self.workdir.rstrip('/')}/"):
             file_.path = f"{self.workdir}/{file_.path}"
         return file_
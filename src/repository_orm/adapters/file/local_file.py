@@ -2,13 +2,17 @@
 
 import logging
 import os
-from typing import AnyStr
+import shutil
+from typing import AnyStr, BinaryIO, Union
 
 from ...model import File
 from .abstract import FileRepository
 
 log = logging.getLogger(__name__)
 
+# Size of the chunks used to copy the content of the files.
+_CHUNK_SIZE = 1024 * 1024
+
 
 class LocalFileRepository(FileRepository[AnyStr]):
     """Define the local filesystem adapter."""
@@ -18,39 +22,63 @@ class LocalFileRepository(FileRepository[AnyStr]):
 
         Creates the working directory if it doesn't exist.
         """
-        if not os.path.exists(workdir):
-            os.makedirs(workdir)
+        os.makedirs(workdir, exist_ok=True)
         super().__init__(workdir=workdir)
 
     def load(self, file_: File[AnyStr]) -> File[AnyStr]:
         """Load the content of the file from the persistence system."""
         log.debug(f"Loading content of file {file_.path}")
         file_ = self.fix_path(file_)
+        path = os.path.expanduser(file_.path)
+        content: Union[str, bytes]
         if file_.is_bytes:
-            mode = "rb"
-            encoding = None
+            content = _read_bytes(path)
         else:
-            mode = "r"
-            encoding = "utf-8"
-
-        with open(
-            os.path.expanduser(file_.path), mode, encoding=encoding
-        ) as file_descriptor:
-            # W0212: Access to private attribute, but it's managed by us so it's OK
-            file_._content = file_descriptor.read()  # noqa: W0212
+            with open(path, "r", encoding="utf-8") as file_descriptor:
+                content = file_descriptor.read()
+
+        # W0212: Access to private attribute, but it's managed by us so it's OK
+        # ignore: the type of the content is defined by the is_bytes attribute
+        file_._content = content  # type: ignore # noqa: W0212
         return file_
 
     def save(self, file_: File[AnyStr]) -> File[AnyStr]:
         """Save the content of the file into the persistence system."""
         log.debug(f"Saving the content of file {file_.path}")
         file_ = self.fix_path(file_)
-        if file_.is_bytes:
-            mode = "wb+"
+        path = os.path.expanduser(file_.path)
+        content = file_.content
+        if isinstance(content, bytes):
+            _write_bytes(path, content)
         else:
-            mode = "w+"
+            with open(path, "w+") as file_descriptor:
+                file_descriptor.write(content)
+
+        return file_
+
+    def stream_load(self, file_: File[AnyStr], destination: BinaryIO) -> None:
+        """Copy the content of the file into a binary file object.
+
+        The content is not loaded into the File object, so it can be used with files
+        that don't fit in memory.
+        """
+        log.debug(f"Streaming the content of file {file_.path}")
+        file_ = self.fix_path(file_)
+
+        with open(os.path.expanduser(file_.path), "rb") as file_descriptor:
+            _copy_file(file_descriptor, destination)
+
+    def stream_save(self, file_: File[AnyStr], source: BinaryIO) -> File[AnyStr]:
+        """Save the content of a binary file object into the persistence system.
 
-        with open(os.path.expanduser(file_.path), mode) as file_descriptor:
-            file_descriptor.write(file_.content)
+        The content is not loaded into the File object, so it can be used with files
+        that don't fit in memory.
+        """
+        log.debug(f"Saving the streamed content of file {file_.path}")
+        file_ = self.fix_path(file_)
+
+        with open(os.path.expanduser(file_.path), "wb+") as file_descriptor:
+            shutil.copyfileobj(source, file_descriptor, _CHUNK_SIZE)
 
         return file_
 
@@ -64,3 +92,55 @@ class LocalFileRepository(FileRepository[AnyStr]):
                 f"Can't remove the file {file_.path} as it doesn't exist "
                 "in the file repository."
             )
+
+
+def _copy_file(source: BinaryIO, destination: BinaryIO) -> None:
+    """Copy the content of a local file into a binary file object.
+
+    If the destination has a file descriptor, the content is copied by the kernel
+    with `os.sendfile`, otherwise it's copied in chunks.
+    """
+    sent = 0
+    try:
+        destination.flush()
+        destination_descriptor = destination.fileno()
+        size = os.fstat(source.fileno()).st_size
+        while sent < size:
+            chunk = os.sendfile(
+                destination_descriptor, source.fileno(), sent, size - sent
+            )
+            if chunk == 0:
+                break
+            sent += chunk
+    except (AttributeError, OSError):
+        # The destination is not a file or the platform doesn't support sendfile.
+        if sent != 0:
+            raise
+        shutil.copyfileobj(source, destination, _CHUNK_SIZE)
+
+
+def _read_bytes(path: str) -> bytes:
+    """Read the content of a binary file without the Python buffered layers."""
+    descriptor = os.open(path, os.O_RDONLY)
+    try:
+        chunks = []
+        size = max(os.fstat(descriptor).st_size, 1)
+        while True:
+            chunk = os.read(descriptor, size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(descriptor)
+
+
+def _write_bytes(path: str, content: bytes) -> None:
+    """Write the content of a binary file without the Python buffered layers."""
+    descriptor = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(content)
+        while view:
+            view = view[os.write(descriptor, view) :]
+    finally:
+        os.close(descriptor)
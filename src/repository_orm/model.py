@@ -2,7 +2,19 @@
 
 import os
 from datetime import datetime
-from typing import Any, AnyStr, Dict, Generic, List, Optional, Sequence, TypeVar, Union
+from typing import (
+    Any,
+    AnyStr,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    Generic,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from pydantic import AnyHttpUrl, BaseModel, PrivateAttr
 
@@ -19,19 +31,13 @@ class Entity(BaseModel):
 
     An entity with a negative id means that the id needs to be set by the repository.
 
-    The _defined_values are used to know which attributes were set by the user at the
-    time of merging objects.
+    The attributes set by the user are tracked in pydantic's __fields_set__, they are
+    the ones propagated when merging objects.
     """
 
     id_: EntityID = -1
-    _defined_values: Dict[str, Any] = PrivateAttr()
-    _skip_on_merge: List[str] = []
-
-    # ANN401: Any not allowed, but it's what we have.
-    def __init__(self, **data: Any) -> None:  # noqa: ANN401
-        """Initialize the defined values."""
-        super().__init__(**data)
-        self._defined_values = data
+    # Attributes that are not propagated when merging entities.
+    _skip_on_merge: ClassVar[FrozenSet[str]] = frozenset()
 
     def __lt__(self, other: "Entity") -> bool:
         """Assert if an object is smaller than us.
@@ -39,9 +45,12 @@ class Entity(BaseModel):
         Args:
             other: Entity to compare.
         """
-        if isinstance(other.id_, int) and isinstance(self.id_, int):
-            return self.id_ < other.id_
-        return str(self.id_) < str(other.id_)
+        id_, other_id = self.id_, other.id_
+        # Comparing the classes is cheaper than the isinstance checks, and it's done
+        # for every comparison when sorting entities.
+        if id_.__class__ is int and other_id.__class__ is int:
+            return id_ < other_id
+        return str(id_) < str(other_id)
 
     def __gt__(self, other: "Entity") -> bool:
         """Assert if an object is greater than us.
@@ -49,25 +58,33 @@ class Entity(BaseModel):
         Args:
             other: Entity to compare.
         """
-        if isinstance(other.id_, int) and isinstance(self.id_, int):
-            return self.id_ > other.id_
-        return str(self.id_) > str(other.id_)
+        return other.__lt__(self)
+
+    def __eq__(self, other: object) -> bool:
+        """Assert if an object is equal to us.
+
+        Entities are only comparable with entities of the same model, comparing
+        the attributes directly is cheaper than pydantic's export of both objects.
+
+        Args:
+            other: Object to compare.
+        """
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.__dict__ == other.__dict__
 
     def __hash__(self) -> int:
         """Create an unique hash of the class object."""
-        return hash(f"{self.model_name}-{self.id_}")
-
-    # ANN401: Any not allowed, but it's what we have.
-    def __setattr__(self, attribute: str, value: Any) -> None:  # noqa: ANN401
-        """Store the set attribute into the _defined_values."""
-        if attribute != "_defined_values":
-            self._defined_values[attribute] = value
-        super().__setattr__(attribute, value)
+        return hash((self.model_name, self.id_))
 
     @property
     def model_name(self) -> str:
-        """Return the entity model name."""
-        return self.schema()["title"]
+        """Return the entity model name.
+
+        It's the title of the model schema, read from the model configuration
+        instead of building the whole schema.
+        """
+        return self.__config__.title or type(self).__name__
 
     def merge(self, other: "Entity") -> "Entity":
         """Update the attributes with the ones manually set by the user of other.
@@ -87,10 +104,19 @@ class Entity(BaseModel):
             raise ValueError(f"Can't merge two {self.model_name}s with different ids")
 
         # Merge objects
-        # W0212: access to an internal property, but it's managed by us so there is
-        # no problem on it.
-        for attribute, value in other._defined_values.items():  # noqa: W0212
-            if attribute not in self._skip_on_merge:
+        updates = {
+            attribute: getattr(other, attribute)
+            for attribute in other.__fields_set__
+            if attribute not in self._skip_on_merge
+        }
+
+        # If the assignments don't need to be validated, the fields are updated at
+        # once instead of going through pydantic's __setattr__ for each of them.
+        if self.__config__.allow_mutation and not self.__config__.validate_assignment:
+            self.__dict__.update(updates)
+            self.__fields_set__.update(updates)
+        else:
+            for attribute, value in updates.items():
                 setattr(self, attribute, value)
 
         return self
@@ -98,7 +124,9 @@ class Entity(BaseModel):
     @property
     def defined_values(self) -> Dict[str, Any]:
         """Return the entity defined values."""
-        return self._defined_values
+        return {
+            attribute: getattr(self, attribute) for attribute in self.__fields_set__
+        }
 
     def clear_defined_values(self) -> None:
         """Remove all references to defined values.
@@ -106,7 +134,7 @@ class Entity(BaseModel):
         I tried to return self so that it can be used chained with repo.get(), but I get
         a mypy error `Incompatible return value type (got "Entity", expected "Entity")`
         """
-        self._defined_values = {}
+        self.__fields_set__.clear()
 
 
 EntityT = TypeVar("EntityT", bound=Entity)
@@ -133,21 +161,34 @@ class File(Entity, Generic[AnyStr]):
     _content: Optional[AnyStr] = PrivateAttr(None)
     # If the content is of type bytes
     is_bytes: bool = False
+    # Path, dirname, basename and extension of the file, they're parsed once per
+    # path change.
+    _path_parts: Optional[Tuple[str, str, str, str]] = PrivateAttr(None)
 
     @property
     def basename(self) -> str:
         """Return the name of the file."""
-        return os.path.basename(self.path)
+        return self._parse_path()[2]
 
     @property
     def dirname(self) -> str:
         """Return the name of the file."""
-        return os.path.dirname(self.path)
+        return self._parse_path()[1]
 
     @property
     def extension(self) -> str:
         """Return the name of the file."""
-        return self.basename.split(".")[-1]
+        return self._parse_path()[3]
+
+    def _parse_path(self) -> Tuple[str, str, str, str]:
+        """Return the parts of the path of the file.
+
+        They're cached until the path changes.
+        """
+        if self._path_parts is None or self._path_parts[0] != self.path:
+            dirname, basename = os.path.split(self.path)
+            self._path_parts = (self.path, dirname, basename, basename.split(".")[-1])
+        return self._path_parts
 
     @property
     def content(self) -> AnyStr:
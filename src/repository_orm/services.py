@@ -6,17 +6,26 @@ and handlers to achieve the program's purpose.
 
 # W0611: It thinks that AnyStr is not used, but it is
 
-from typing import TYPE_CHECKING, AnyStr, Union  # noqa: W0611
+from importlib import import_module
+from typing import TYPE_CHECKING, AnyStr, Dict, Tuple, Union  # noqa: W0611
 
-from .adapters.data.fake import FakeRepository
-from .adapters.data.pypika import PypikaRepository
-from .adapters.data.tinydb import TinyDBRepository
 from .adapters.file.local_file import LocalFileRepository
 
 if TYPE_CHECKING:
+    from .adapters.data.fake import FakeRepository
+    from .adapters.data.pypika import PypikaRepository
+    from .adapters.data.tinydb import TinyDBRepository
     from .adapters.file.abstract import FileRepository
 
-Repository = Union[FakeRepository, PypikaRepository, TinyDBRepository]
+Repository = Union["FakeRepository", "PypikaRepository", "TinyDBRepository"]
+
+# Module and class of the repository of each database url protocol. They are
+# imported when used, so only the libraries of the used backend are loaded.
+_REPOSITORIES: Dict[str, Tuple[str, str]] = {
+    "fake": (".adapters.data.fake", "FakeRepository"),
+    "sqlite": (".adapters.data.pypika", "PypikaRepository"),
+    "tinydb": (".adapters.data.tinydb", "TinyDBRepository"),
+}
 
 
 def load_repository(
@@ -30,14 +39,13 @@ def load_repository(
     Returns:
         Repository that understands the url protocol.
     """
-    if "fake://" in database_url:
-        return FakeRepository("")
-    if "sqlite://" in database_url:
-        return PypikaRepository(database_url)
-    if "tinydb://" in database_url:
-        return TinyDBRepository(database_url)
+    protocol, separator, _ = database_url.partition("://")
+    if not separator or protocol not in _REPOSITORIES:
+        raise ValueError(f"Database URL: {database_url} not recognized.")
 
-    raise ValueError(f"Database URL: {database_url} not recognized.")
+    module_name, class_name = _REPOSITORIES[protocol]
+    repository = getattr(import_module(module_name, __package__), class_name)
+    return repository(database_url)
 
 
 def load_file_repository(url: str = "local:.") -> "FileRepository[AnyStr]":
@@ -49,7 +57,7 @@ def load_file_repository(url: str = "local:.") -> "FileRepository[AnyStr]":
     Returns:
         File Repository that understands the url protocol.
     """
-    if "local:" in url:
-        return LocalFileRepository(workdir=url.split(":")[1])
+    if url.startswith("local:"):
+        return LocalFileRepository(workdir=url.partition(":")[2])
 
     raise ValueError(f"File Repository URL: {url} not recognized.")
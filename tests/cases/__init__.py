@@ -3,7 +3,7 @@
 Import the created cases so they are easily accessible too.
 """
 
-from .entities import EntityCases, IntEntityCases, StrEntityCases
+from .entities import ENTITY_FACTORIES, INT_ENTITY_FACTORIES, STR_ENTITY_FACTORIES
 from .model import Entity, OtherEntity
 from .repositories import RepositoryCases
 from .testers import RepositoryTester
@@ -12,8 +12,8 @@ __all__ = [
     "Entity",
     "OtherEntity",
     "RepositoryCases",
-    "EntityCases",
+    "ENTITY_FACTORIES",
     "RepositoryTester",
-    "IntEntityCases",
-    "StrEntityCases",
+    "INT_ENTITY_FACTORIES",
+    "STR_ENTITY_FACTORIES",
 ]
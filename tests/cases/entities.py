@@ -1,77 +1,138 @@
 """Gather the cases and fixtures needed to test the model Entities."""
 
-from typing import Any, Type
-
-from pydantic_factories import ModelFactory
-
-from .model import Article, Author, Book, Genre, ListEntity
-
-
-class EntityCases:
-    """Gather all the entities to test."""
-
-    def case_author(self) -> Type[ModelFactory[Any]]:
-        """Return the Author factory."""
-        return AuthorFactory
-
-    def case_book(self) -> Type[ModelFactory[Any]]:
-        """Return the Book factory."""
-        return BookFactory
+from functools import lru_cache
+from typing import Any, List, Tuple, Type
+
+from faker import Faker
+from pydantic_factories import ModelFactory, Use
+
+from .model import Article, Author, Book, Entity, Genre, ListEntity
+
+# Number of entities built for each factory, it's the size of the biggest batch
+# used by the entity fixtures.
+POOL_SIZE = 3
+
+# Faker instance shared by all the factories, seeded to make the generated
+# entities reproducible between runs.
+FAKE = Faker()
+FAKE.seed_instance(0)
+
+# Dates to choose the release of the books from, picking one of them is cheaper
+# than generating a new date each time.
+RELEASE_DATES = tuple(FAKE.date_time() for _ in range(256))
+
+# Words to fill the list attributes with.
+WORDS = tuple(FAKE.words(nb=1024))
+
+
+class EntityFactory(ModelFactory[Any]):
+    """Define the configuration shared by the entity factories.
+
+    The generated values already match the types of the model fields, so the
+    entities are built with the model's construct method to skip the pydantic
+    validation.
+    """
+
+    __faker__ = FAKE
+
+    @classmethod
+    # ANN401: Any not allowed, but it's what ModelFactory uses.
+    def build(
+        cls,
+        factory_use_construct: bool = True,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Any:  # noqa: ANN401
+        """Build an entity without validating its attributes.
+
+        Args:
+            factory_use_construct: Build the entity with construct instead of the
+                model's __init__.
+            kwargs: Values of the attributes to set instead of the generated ones.
+        """
+        return super().build(factory_use_construct=factory_use_construct, **kwargs)
+
+    @classmethod
+    # ANN401: Any not allowed, but it's what ModelFactory uses.
+    def batch(
+        cls,
+        size: int,
+        factory_use_construct: bool = True,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> List[Any]:
+        """Build a list of entities without validating their attributes.
+
+        Args:
+            size: Number of entities to build.
+            factory_use_construct: Build the entities with construct instead of
+                the model's __init__.
+            kwargs: Values of the attributes to set instead of the generated ones.
+        """
+        return [
+            cls.build(factory_use_construct=factory_use_construct, **kwargs)
+            for _ in range(size)
+        ]
+
+
+class AuthorFactory(EntityFactory):
+    """Factory to generate fake authors."""
 
-    def case_genre(self) -> Type[ModelFactory[Any]]:
-        """Return the Genre factory."""
-        return GenreFactory
+    __model__ = Author
 
-    def case_article(self) -> Type[ModelFactory[Any]]:
-        """Return the Genre factory."""
-        return ArticleFactory
 
+class BookFactory(EntityFactory):
+    """Factory to generate fake books."""
 
-class StrEntityCases:
-    """Gather all the entities to test with type(id_) == str."""
+    __model__ = Book
 
-    def case_author(self) -> Type[ModelFactory[Any]]:
-        """Return the Author factory."""
-        return AuthorFactory
+    released = Use(FAKE.random.choice, RELEASE_DATES)
 
 
-class IntEntityCases:
-    """Gather all the entities to test with type(id_) == int."""
+class GenreFactory(EntityFactory):
+    """Factory to generate fake genres."""
 
-    def case_book(self) -> Type[ModelFactory[Any]]:
-        """Return the Book factory."""
-        return BookFactory
+    __model__ = Genre
 
-    def case_genre(self) -> Type[ModelFactory[Any]]:
-        """Return the Genre factory."""
-        return GenreFactory
 
+class ListEntityFactory(EntityFactory):
+    """Factory to generate fake list of entities."""
 
-class AuthorFactory(ModelFactory[Any]):
-    """Factory to generate fake authors."""
+    __model__ = ListEntity
 
-    __model__ = Author
+    elements = Use(FAKE.random.choices, WORDS, k=5)
 
 
-class BookFactory(ModelFactory[Any]):
-    """Factory to generate fake books."""
+class ArticleFactory(EntityFactory):
+    """Factory to generate fake list of entities."""
 
-    __model__ = Book
+    __model__ = Article
 
 
-class GenreFactory(ModelFactory[Any]):
-    """Factory to generate fake genres."""
+# Factories of the entities to test.
+ENTITY_FACTORIES = [AuthorFactory, BookFactory, GenreFactory, ArticleFactory]
+# Factories of the entities to test with type(id_) == str.
+STR_ENTITY_FACTORIES = [AuthorFactory]
+# Factories of the entities to test with type(id_) == int.
+INT_ENTITY_FACTORIES = [BookFactory, GenreFactory]
 
-    __model__ = Genre
 
+@lru_cache(maxsize=None)
+def _entity_pool(factory: Type[ModelFactory[Any]]) -> Tuple[Entity, ...]:
+    """Build the entities of a factory once per test session.
 
-class ListEntityFactory(ModelFactory[Any]):
-    """Factory to generate fake list of entities."""
+    Args:
+        factory: Factory of the entities to build.
+    """
+    return tuple(factory.batch(POOL_SIZE))
 
-    __model__ = ListEntity
 
+def build_entities(factory: Type[ModelFactory[Any]], size: int) -> List[Entity]:
+    """Return copies of the entities built by a factory.
 
-class ArticleFactory(ModelFactory[Any]):
-    """Factory to generate fake list of entities."""
+    The entities are built once and copied afterwards, so the tests can change
+    them without affecting the rest.
 
-    __model__ = Article
+    Args:
+        factory: Factory of the entities to build.
+        size: Number of entities to return, up to POOL_SIZE.
+    """
+    return [entity.copy(deep=True) for entity in _entity_pool(factory)[:size]]
@@ -1,7 +1,8 @@
 """Store a default model use case to use in the tests."""
 
 from datetime import datetime
-from typing import List, Optional
+from enum import Enum
+from typing import ClassVar, FrozenSet, List, Optional
 
 from pydantic import AnyHttpUrl
 
@@ -41,7 +42,7 @@ class Genre(Entity):
     description: Optional[str] = None
     rating: Optional[int] = None
 
-    _skip_on_merge: List[str] = ["rating"]
+    _skip_on_merge: ClassVar[FrozenSet[str]] = frozenset({"rating"})
 
 
 class Article(Entity):
@@ -68,3 +69,16 @@ class BoolEntity(Entity):
     """Entity to model an entity that has a boolean attribute."""
 
     active: bool = True
+
+
+class Color(Enum):
+    """Define the colors of the EnumEntity."""
+
+    RED = "red"
+    BLUE = "blue"
+
+
+class EnumEntity(Entity):
+    """Entity to model an entity that has an Enum attribute."""
+
+    color: Color = Color.RED
@@ -1,17 +1,8 @@
 """Gather the repository cases."""
 
-import sqlite3
-from typing import AnyStr, Tuple
+from typing import TYPE_CHECKING, AnyStr, Tuple
 
-from tinydb import TinyDB
-
-from repository_orm import (
-    FakeRepository,
-    FakeRepositoryDB,
-    LocalFileRepository,
-    PypikaRepository,
-    TinyDBRepository,
-)
+from repository_orm import FakeRepository, FakeRepositoryDB, LocalFileRepository
 from repository_orm.model import EntityT
 
 from .testers import (
@@ -21,12 +12,19 @@ from .testers import (
     TinyDBRepositoryTester,
 )
 
+if TYPE_CHECKING:
+    import sqlite3
+
+    from tinydb import TinyDB
+
+    from repository_orm import PypikaRepository, TinyDBRepository
+
 
 class RepositoryCases:
     """Gather all the repositories to test."""
 
     def case_fake(
-        self, repo_fake: FakeRepository
+        self, repo_fake: FakeRepository, fake_tester: FakeRepositoryTester
     ) -> Tuple[
         FakeRepositoryDB[EntityT], FakeRepository, FakeRepository, FakeRepositoryTester
     ]:
@@ -39,13 +37,14 @@ class RepositoryCases:
                 so it's the same as the empty repository.
             repo_tester: The tester class for the Fakerepository.
         """
-        return repo_fake.entities, repo_fake, repo_fake, FakeRepositoryTester()
+        return repo_fake.entities, repo_fake, repo_fake, fake_tester
 
     def case_tinydb(
         self,
-        db_tinydb: Tuple[str, TinyDB],
-        repo_tinydb: TinyDBRepository,
-    ) -> Tuple[str, TinyDBRepository, TinyDBRepository, TinyDBRepositoryTester]:
+        db_tinydb: Tuple[str, "TinyDB"],
+        repo_tinydb: "TinyDBRepository",
+        tinydb_tester: TinyDBRepositoryTester,
+    ) -> Tuple[str, "TinyDBRepository", "TinyDBRepository", TinyDBRepositoryTester]:
         """Return the objects to test the FakeRepository.
 
         Returns:
@@ -54,14 +53,15 @@ class RepositoryCases:
             repo: A TinyDBRepository with the schema applied.
             repo_tester: The tester class for the TinyDBRepository.
         """
-        return db_tinydb[0], repo_tinydb, repo_tinydb, TinyDBRepositoryTester()
+        return db_tinydb[0], repo_tinydb, repo_tinydb, tinydb_tester
 
     def case_pypika(
         self,
-        db_sqlite: Tuple[str, sqlite3.Cursor],
-        empty_repo_pypika: PypikaRepository,
-        repo_pypika: PypikaRepository,
-    ) -> Tuple[str, PypikaRepository, PypikaRepository, PypikaRepositoryTester]:
+        db_sqlite: Tuple[str, "sqlite3.Cursor"],
+        empty_repo_pypika: "PypikaRepository",
+        repo_pypika: "PypikaRepository",
+        pypika_tester: PypikaRepositoryTester,
+    ) -> Tuple[str, "PypikaRepository", "PypikaRepository", PypikaRepositoryTester]:
         """Return the objects to test the FakeRepository.
 
         Returns:
@@ -71,14 +71,16 @@ class RepositoryCases:
             repo_tester: The tester class for the PypikaRepository.
         """
         # Return a clean database connection
-        return db_sqlite[0], empty_repo_pypika, repo_pypika, PypikaRepositoryTester()
+        return db_sqlite[0], empty_repo_pypika, repo_pypika, pypika_tester
 
 
 class FileRepositoryCases:
     """Gather all the file repositories to test."""
 
     def case_local_file(
-        self, repo_local_file: LocalFileRepository[AnyStr]
+        self,
+        repo_local_file: LocalFileRepository[AnyStr],
+        local_file_tester: LocalFileRepositoryTester[AnyStr],
     ) -> Tuple[LocalFileRepository[AnyStr], LocalFileRepositoryTester[AnyStr]]:
         """Return the objects to test the LocalFileRepository.
 
@@ -86,4 +88,4 @@ class FileRepositoryCases:
             repo: A LocalFileRepository with the workdir configured.
             repo_tester: The tester class for the LocalFilerepository.
         """
-        return repo_local_file, LocalFileRepositoryTester()
+        return repo_local_file, local_file_tester
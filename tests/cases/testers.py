@@ -6,10 +6,11 @@ import json
 import logging
 import os
 import sqlite3
-from typing import Any, AnyStr, Dict, Generator, Generic, List, Type
+from functools import lru_cache
+from typing import Any, AnyStr, Dict, Generic, List, NamedTuple, Tuple, Type
 
 from _pytest.logging import LogCaptureFixture
-from pypika import Query, Table
+from pypika import Parameter, Query, Table
 
 from repository_orm import (
     EntityNotFoundError,
@@ -20,7 +21,18 @@ from repository_orm import (
     TinyDBRepository,
 )
 from repository_orm.adapters.data.abstract import RepositoryT
-from repository_orm.model import EntityT
+from repository_orm.model import EntityID, EntityT
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+# Prefix of the dates serialized by tinydb_serialization's DateTimeSerializer.
+_TINYDB_DATE = "{TinyDate}:"
+
+# Connections of the PypikaRepositoryTester to each database url.
+_SQLITE_CONNECTIONS: Dict[str, sqlite3.Connection] = {}
 
 
 class RepositoryTester(abc.ABC, Generic[RepositoryT]):
@@ -83,7 +95,7 @@ class FakeRepositoryTester(RepositoryTester[FakeRepository]):
     ) -> List[EntityT]:
         """Get all the entities of type entity_model from the database."""
         try:
-            return [entity for entity_id, entity in database[entity_model].items()]
+            return list(database[entity_model].values())
         except (TypeError, KeyError) as error:
             raise EntityNotFoundError() from error
 
@@ -91,12 +103,7 @@ class FakeRepositoryTester(RepositoryTester[FakeRepository]):
         self, database: FakeRepositoryDB[EntityT], entity: EntityT
     ) -> None:
         """Insert the data of an entity into the repository."""
-        try:
-            database[type(entity)]
-        except KeyError:
-            database[type(entity)] = {}
-
-        database[type(entity)][entity.id_] = entity.copy()
+        database.setdefault(type(entity), {})[entity.id_] = entity.copy()
 
 
 class TinyDBRepositoryTester(RepositoryTester[TinyDBRepository]):
@@ -113,26 +120,25 @@ class TinyDBRepositoryTester(RepositoryTester[TinyDBRepository]):
         """Apply the repository migrations."""
 
     @staticmethod
-    def _build_cursor(database_url: str) -> Dict[Any, Any]:
-        """Load the database data as a python object."""
+    def _build_cursor(database_url: str) -> "_TinyDBContent":
+        """Load the database data as a python object.
+
+        The object is shared between the calls that read the same content, so it
+        must not be modified.
+        """
         database_file = database_url.replace("tinydb:///", "")
 
-        with open(database_file, "r", encoding="utf-8") as file_cursor:
-            content = file_cursor.read()
-            if content == "":
-                content = '{"_default": {}}'
-            return json.loads(content)
+        with open(database_file, "rb") as file_cursor:
+            return _load_tinydb(file_cursor.read())
 
     def get_entity(self, database: str, entity: EntityT) -> EntityT:
         """Get the entity object from the data stored in the repository by it's id."""
-        cursor = self._build_cursor(database)
-        for _document_id, entry in cursor["_default"].items():
-            if (
-                entry["id_"] == entity.id_
-                and entry["model_type_"] == entity.model_name.lower()
-            ):
-                return self._build_entity(entry, entity.__class__)
-        raise EntityNotFoundError()
+        documents = self._build_cursor(database).documents
+        try:
+            entry = documents[(entity.model_name.lower(), entity.id_)]
+        except KeyError as error:
+            raise EntityNotFoundError() from error
+        return self._build_entity(entry, entity.__class__)
 
     @staticmethod
     def _build_entity(
@@ -147,56 +153,62 @@ class TinyDBRepositoryTester(RepositoryTester[TinyDBRepository]):
         Returns:
             entity: Entity object built from the data.
         """
+        entity_data = dict(entity_data)
         entity_data.pop("model_type_")
         for key, value in entity_data.items():
-            if isinstance(value, str) and "TinyDate" in value:
-                value = value.replace("{TinyDate}:", "")
-                entity_data[key] = datetime.datetime.fromisoformat(value)
+            if isinstance(value, str) and value.startswith(_TINYDB_DATE):
+                entity_data[key] = datetime.datetime.fromisoformat(
+                    value[len(_TINYDB_DATE) :]
+                )
 
         return entity_model.parse_obj(entity_data)
 
     def get_all(self, database: str, entity_model: Type[EntityT]) -> List[EntityT]:
         """Get all the entities of type entity_model from the database."""
-        cursor = self._build_cursor(database)
-        entities = []
-        for _document_id, entry in cursor["_default"].items():
-            if entry["model_type_"] == entity_model.__name__.lower():
-                entities.append(self._build_entity(entry, entity_model))
-        return entities
+        models = self._build_cursor(database).models
+        return [
+            self._build_entity(entry, entity_model)
+            for entry in models.get(entity_model.__name__.lower(), [])
+        ]
 
     def insert_entity(self, database: str, entity: EntityT) -> None:
         """Insert the data of an entity into the repository."""
-        cursor = self._build_cursor(database)
+        content = self._build_cursor(database)
+        cursor = content.database
 
         database_entry = entity.dict()
         database_entry["model_type_"] = entity.model_name.lower()
         for key, value in database_entry.items():
             if isinstance(value, datetime.datetime):
-                database_entry[key] = "{TinyDate}:" + value.isoformat()
-
-        try:
-            max_document = int(max(key for key in cursor["_default"]))
-        except ValueError:
-            max_document = -1
+                database_entry[key] = _TINYDB_DATE + value.isoformat()
 
-        cursor["_default"][max_document + 1] = database_entry
+        cursor = {
+            **cursor,
+            "_default": {**cursor["_default"], content.last_id + 1: database_entry},
+        }
 
         database_file = database.replace("tinydb:///", "")
-        with open(database_file, "w+", encoding="utf-8") as file_cursor:
-            file_cursor.write(json.dumps(cursor))
+        with open(database_file, "wb+") as file_cursor:
+            file_cursor.write(_dump_tinydb(cursor))
 
 
 class PypikaRepositoryTester(RepositoryTester[PypikaRepository]):
     """Gathers methods needed to test the implementation of the PypikaRepository."""
 
     @staticmethod
-    def _build_cursor(database_url: str) -> Generator[sqlite3.Cursor, None, None]:
-        """Create a cursor to connect to the database."""
-        connection = sqlite3.connect(database_url.replace("sqlite:///", ""))
+    def _build_cursor(database_url: str) -> sqlite3.Cursor:
+        """Create a cursor to connect to the database.
 
-        yield connection.cursor()
+        The connection to each database is reused until close_sqlite_connections is
+        called.
+        """
+        try:
+            connection = _SQLITE_CONNECTIONS[database_url]
+        except KeyError:
+            connection = sqlite3.connect(database_url.replace("sqlite:///", ""))
+            _SQLITE_CONNECTIONS[database_url] = connection
 
-        connection.close()
+        return connection.cursor()
 
     def apply_migrations(self, repo: PypikaRepository) -> None:
         """Apply the repository migrations."""
@@ -208,7 +220,7 @@ class PypikaRepositoryTester(RepositoryTester[PypikaRepository]):
         caplog: LogCaptureFixture,
     ) -> None:
         """Make sure that the repository has a valid schema."""
-        cursor = next(self._build_cursor(database))
+        cursor = self._build_cursor(database)
         assert len(cursor.execute("SELECT * from _yoyo_log").fetchall()) > 0
         assert (
             "repository_orm.adapters.data.pypika",
@@ -226,7 +238,7 @@ class PypikaRepositoryTester(RepositoryTester[PypikaRepository]):
             entity_model: The model of the entity to build
             query: pypika query of the entities you want to build
         """
-        cursor = next(self._build_cursor(database))
+        cursor = self._build_cursor(database)
         cursor = cursor.execute(str(query))
 
         entities_data = cursor.fetchall()
@@ -268,13 +280,15 @@ class PypikaRepositoryTester(RepositoryTester[PypikaRepository]):
 
     def insert_entity(self, database: str, entity: EntityT) -> None:
         """Insert the data of an entity into the repository."""
-        table = Table(entity.model_name.lower())
-        cursor = next(self._build_cursor(database))
-        columns = list(entity.dict().keys())
+        cursor = self._build_cursor(database)
+        entity_data = entity.dict()
+        columns = list(entity_data.keys())
         columns[columns.index("id_")] = "id"
-        values = [value for key, value in entity.dict().items()]
-        query = Query.into(table).columns(tuple(columns)).insert(tuple(values))
-        cursor.execute(str(query))
+        values = [
+            value.isoformat() if isinstance(value, datetime.datetime) else value
+            for value in entity_data.values()
+        ]
+        cursor.execute(_insert_query(entity.model_name.lower(), tuple(columns)), values)
         cursor.connection.commit()
 
 
@@ -324,3 +338,87 @@ class LocalFileRepositoryTester(FileRepositoryTester[AnyStr]):
     def exists(self, path: str) -> bool:
         """Test if the file exists in the repository."""
         return os.path.isfile(path)
+
+
+def close_sqlite_connections() -> None:
+    """Close the connections of the PypikaRepositoryTester to the databases."""
+    for connection in _SQLITE_CONNECTIONS.values():
+        connection.close()
+    _SQLITE_CONNECTIONS.clear()
+
+
+@lru_cache(maxsize=None)
+def _insert_query(table: str, columns: Tuple[str, ...]) -> str:
+    """Return the SQL statement that inserts a row in a table.
+
+    The values are passed as parameters, so the statement only depends on the table
+    and the columns.
+
+    Args:
+        table: Name of the table.
+        columns: Names of the columns of the row.
+    """
+    return str(
+        Query.into(Table(table))
+        .columns(*columns)
+        .insert(*(Parameter("?") for _ in columns))
+    )
+
+
+class _TinyDBContent(NamedTuple):
+    """Parsed content of a TinyDB database file.
+
+    Attributes:
+        database: Data of the database.
+        documents: Documents of the default table indexed by their model type and
+            id.
+        models: Documents of the default table grouped by their model type.
+        last_id: Biggest document id of the default table, -1 if it's empty.
+    """
+
+    database: Dict[Any, Any]
+    documents: Dict[Tuple[str, EntityID], Dict[Any, Any]]
+    models: Dict[str, List[Dict[Any, Any]]]
+    last_id: int
+
+
+@lru_cache(maxsize=32)
+def _load_tinydb(content: bytes) -> _TinyDBContent:
+    """Parse the content of a TinyDB database file.
+
+    The tests read the same database content several times, so the parsed data and
+    its indexes are cached by the content of the file. Reading the file is much
+    cheaper than parsing it.
+
+    Args:
+        content: Content of the database file.
+    """
+    if content == b"":
+        content = b'{"_default": {}}'
+    if orjson is None:
+        database = json.loads(content)
+    else:
+        database = orjson.loads(content)
+
+    documents = {}
+    models: Dict[str, List[Dict[Any, Any]]] = {}
+    last_id = -1
+    for document_id, entry in database["_default"].items():
+        documents[(entry["model_type_"], entry["id_"])] = entry
+        models.setdefault(entry["model_type_"], []).append(entry)
+        last_id = max(last_id, int(document_id))
+
+    return _TinyDBContent(
+        database=database, documents=documents, models=models, last_id=last_id
+    )
+
+
+def _dump_tinydb(database: Dict[Any, Any]) -> bytes:
+    """Serialize the data of a TinyDB database to the content of its file.
+
+    Args:
+        database: Data of the database.
+    """
+    if orjson is None:
+        return json.dumps(database).encode("utf-8")
+    return orjson.dumps(database, option=orjson.OPT_NON_STR_KEYS)
@@ -7,7 +7,7 @@ from typing import Any, AnyStr, Generator, List, Tuple, Type
 
 import pytest
 from pydantic_factories import ModelFactory
-from pytest_cases import fixture, parametrize_with_cases, unpack_fixture
+from pytest_cases import fixture, parametrize, parametrize_with_cases, unpack_fixture
 from tinydb import TinyDB
 
 from repository_orm import (
@@ -20,15 +20,23 @@ from repository_orm import (
 from repository_orm.adapters.file.abstract import FileRepository
 
 from .cases import (
+    ENTITY_FACTORIES,
+    INT_ENTITY_FACTORIES,
+    STR_ENTITY_FACTORIES,
     Entity,
-    EntityCases,
-    IntEntityCases,
     RepositoryCases,
     RepositoryTester,
-    StrEntityCases,
 )
+from .cases.entities import build_entities
 from .cases.repositories import FileRepositoryCases
-from .cases.testers import FileRepositoryTester
+from .cases.testers import (
+    FakeRepositoryTester,
+    FileRepositoryTester,
+    LocalFileRepositoryTester,
+    PypikaRepositoryTester,
+    TinyDBRepositoryTester,
+    close_sqlite_connections,
+)
 
 # ---------------------
 # - Database fixtures -
@@ -57,6 +65,7 @@ def db_sqlite_(tmp_path: Path) -> Generator[Tuple[str, sqlite3.Cursor], None, No
     yield sqlite_url, connection.cursor()
 
     connection.close()
+    close_sqlite_connections()
 
 
 @pytest.fixture(name="db_tinydb")
@@ -117,18 +126,68 @@ def empty_repo_pypika_(
     pika_repo.close()
 
 
+@pytest.fixture(name="pypika_schema", scope="session")
+def pypika_schema_(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """Return the SQL script that builds the database with the migrations applied.
+
+    Running the yoyo migrations is slow, so they are applied once per session, and
+    the script is loaded in the database of each test instead.
+    """
+    sqlite_file_path = str(tmp_path_factory.mktemp("pypika_schema") / "sqlite.db")
+    pika_repo = PypikaRepository(database_url=f"sqlite:///{sqlite_file_path}")
+    pika_repo.apply_migrations("tests/migrations/pypika/")
+    pika_repo.close()
+
+    connection = sqlite3.connect(sqlite_file_path)
+    schema = "\n".join(connection.iterdump())
+    connection.close()
+
+    return schema
+
+
 @pytest.fixture()
 def repo_pypika(
     empty_repo_pypika: PypikaRepository,
+    pypika_schema: str,
 ) -> Generator[PypikaRepository, None, None]:
     """Configure an instance of the PypikaRepository with the migrations applied."""
-    empty_repo_pypika.apply_migrations("tests/migrations/pypika/")
+    empty_repo_pypika.connection.executescript(pypika_schema)
 
     yield empty_repo_pypika
 
     empty_repo_pypika.close()
 
 
+# -------------------
+# - Tester fixtures -
+# -------------------
+# The testers don't have state, so they're shared by all the tests.
+
+
+@pytest.fixture(name="fake_tester", scope="session")
+def fake_tester_() -> FakeRepositoryTester:
+    """Return the tester of the FakeRepository."""
+    return FakeRepositoryTester()
+
+
+@pytest.fixture(name="tinydb_tester", scope="session")
+def tinydb_tester_() -> TinyDBRepositoryTester:
+    """Return the tester of the TinyDBRepository."""
+    return TinyDBRepositoryTester()
+
+
+@pytest.fixture(name="pypika_tester", scope="session")
+def pypika_tester_() -> PypikaRepositoryTester:
+    """Return the tester of the PypikaRepository."""
+    return PypikaRepositoryTester()
+
+
+@pytest.fixture(name="local_file_tester", scope="session")
+def local_file_tester_() -> LocalFileRepositoryTester[AnyStr]:
+    """Return the tester of the LocalFileRepository."""
+    return LocalFileRepositoryTester()
+
+
 @fixture
 @parametrize_with_cases(
     "database_, empty_repo_, repo_, repo_tester_", cases=RepositoryCases
@@ -197,46 +256,51 @@ file_repo, file_repo_tester = unpack_fixture(  # noqa: W0632
 # -------------------
 
 
+def _factory_id(entity_factory: Type[ModelFactory[Any]]) -> str:
+    """Return the id of the tests parametrized with an entity factory."""
+    return entity_factory.__model__.__name__.lower()
+
+
 @fixture(name="entity")
-@parametrize_with_cases("entity_factory", cases=EntityCases)
+@parametrize("entity_factory", ENTITY_FACTORIES, ids=_factory_id)
 def entity_(entity_factory: Type[ModelFactory[Any]]) -> Entity:
-    """Return one entity for each entity type defined in the EntityCases."""
-    return entity_factory.build()
+    """Return one entity for each entity type of the ENTITY_FACTORIES."""
+    return build_entities(entity_factory, 1)[0]
 
 
 @fixture(name="str_entity")
-@parametrize_with_cases("entity_factory", cases=StrEntityCases)
+@parametrize("entity_factory", STR_ENTITY_FACTORIES, ids=_factory_id)
 def str_entity_(entity_factory: Type[ModelFactory[Any]]) -> Entity:
-    """Return one entity for each entity type defined in the StrEntityCases."""
-    return entity_factory.build()
+    """Return one entity for each entity type of the STR_ENTITY_FACTORIES."""
+    return build_entities(entity_factory, 1)[0]
 
 
 @fixture(name="int_entity")
-@parametrize_with_cases("entity_factory", cases=IntEntityCases)
+@parametrize("entity_factory", INT_ENTITY_FACTORIES, ids=_factory_id)
 def int_entity_(entity_factory: Type[ModelFactory[Any]]) -> Entity:
-    """Return one entity for each entity type defined in the IntEntityCases."""
-    return entity_factory.build()
+    """Return one entity for each entity type of the INT_ENTITY_FACTORIES."""
+    return build_entities(entity_factory, 1)[0]
 
 
 @fixture(name="entities")
-@parametrize_with_cases("entity_factory", cases=EntityCases)
+@parametrize("entity_factory", ENTITY_FACTORIES, ids=_factory_id)
 def entities_(entity_factory: Type[ModelFactory[Any]]) -> List[Entity]:
-    """Return three entities for each entity type defined in the EntityCases."""
-    return sorted(entity_factory.batch(3))
+    """Return three entities for each entity type of the ENTITY_FACTORIES."""
+    return sorted(build_entities(entity_factory, 3))
 
 
 @fixture(name="str_entities")
-@parametrize_with_cases("entity_factory", cases=StrEntityCases)
+@parametrize("entity_factory", STR_ENTITY_FACTORIES, ids=_factory_id)
 def str_entities_(entity_factory: Type[ModelFactory[Any]]) -> List[Entity]:
-    """Return three entities for each entity type defined in the StrEntityCases."""
-    return sorted(entity_factory.batch(3))
+    """Return three entities for each entity type of the STR_ENTITY_FACTORIES."""
+    return sorted(build_entities(entity_factory, 3))
 
 
 @fixture(name="int_entities")
-@parametrize_with_cases("entity_factory", cases=IntEntityCases)
+@parametrize("entity_factory", INT_ENTITY_FACTORIES, ids=_factory_id)
 def int_entities_(entity_factory: Type[ModelFactory[Any]]) -> List[Entity]:
-    """Return three entities for each entity type defined in the IntEntityCases."""
-    return sorted(entity_factory.batch(3))
+    """Return three entities for each entity type of the INT_ENTITY_FACTORIES."""
+    return sorted(build_entities(entity_factory, 3))
 
 
 @fixture(name="inserted_entity")
@@ -248,7 +312,7 @@ def inserted_entity_(
 ) -> Entity:
     """Insert one entity in the repository and return it.
 
-    For each entity type defined in the EntityCases.
+    For each entity type of the ENTITY_FACTORIES.
     """
     repo_tester.insert_entity(database, entity)
     return entity
@@ -263,7 +327,7 @@ def inserted_int_entity(
 ) -> Entity:
     """Insert one entity with int id_ in the repository and return it.
 
-    For each entity type defined in the EntityCases.
+    For each entity type of the INT_ENTITY_FACTORIES.
     """
     repo_tester.insert_entity(database, int_entity)
     return int_entity
@@ -278,7 +342,7 @@ def inserted_str_entity(
 ) -> Entity:
     """Insert one entity with str id_ in the repository and return it.
 
-    For each entity type defined in the EntityCases.
+    For each entity type of the STR_ENTITY_FACTORIES.
     """
     repo_tester.insert_entity(database, str_entity)
     return str_entity
@@ -293,7 +357,7 @@ def inserted_entities(
 ) -> List[Entity]:
     """Insert three entities in the repository and return them.
 
-    For each entity type defined in the EntityCases.
+    For each entity type of the ENTITY_FACTORIES.
     """
     for entity_to_insert in entities:
         repo_tester.insert_entity(database, entity_to_insert)
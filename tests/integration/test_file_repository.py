@@ -1,6 +1,7 @@
 """Test the implementation of the FileRepositories."""
 
 import os
+from io import BytesIO
 from pathlib import Path
 from typing import AnyStr
 
@@ -9,6 +10,7 @@ from _pytest.logging import LogCaptureFixture
 
 from repository_orm import File, LocalFileRepository
 from repository_orm.adapters.file.abstract import FileRepository
+from repository_orm.exceptions import FileContentNotLoadedError
 
 from ..cases.testers import FileRepositoryTester
 
@@ -83,6 +85,81 @@ class TestFileRepositories:
 
         assert not file_repo_tester.exists("test.txt")
 
+    def test_repo_can_stream_file_content_into_a_file(
+        self,
+        file_repo: FileRepository[AnyStr],
+        file_repo_tester: FileRepositoryTester[AnyStr],
+        content: AnyStr,
+        tmp_path: Path,
+    ) -> None:
+        """
+        Given: A File in the Repository
+        When: Streaming the File content into another file
+        Then: The content is copied without loading it into the File
+        """
+        is_bytes = isinstance(content, bytes)
+        file_repo_tester.save(content, "test.txt", file_repo.workdir)
+        file_ = File(path="test.txt", is_bytes=is_bytes)
+        destination = tmp_path / "destination.txt"
+
+        with open(destination, "wb") as file_descriptor:
+            file_repo.stream_load(file_, file_descriptor)  # type: ignore # act
+
+        assert destination.read_bytes() == _to_bytes(content)
+        # W0104: statement looks like it's doing nothing, but it is.
+        with pytest.raises(FileContentNotLoadedError):
+            file_.content  # noqa: W0104
+
+    def test_repo_can_stream_file_content_into_a_buffer(
+        self,
+        file_repo: FileRepository[AnyStr],
+        file_repo_tester: FileRepositoryTester[AnyStr],
+        content: AnyStr,
+    ) -> None:
+        """
+        Given: A File in the Repository
+        When: Streaming the File content into an object without file descriptor
+        Then: The content is copied
+        """
+        is_bytes = isinstance(content, bytes)
+        file_repo_tester.save(content, "test.txt", file_repo.workdir)
+        file_ = File(path="test.txt", is_bytes=is_bytes)
+        destination = BytesIO()
+
+        file_repo.stream_load(file_, destination)  # type: ignore # act
+
+        assert destination.getvalue() == _to_bytes(content)
+
+    def test_repo_can_save_streamed_file_content(
+        self,
+        file_repo: FileRepository[AnyStr],
+        file_repo_tester: FileRepositoryTester[AnyStr],
+        content: AnyStr,
+    ) -> None:
+        """
+        Given: A File and a stream with its content
+        When: Saving the stream into the repository
+        Then: The content is persisted, and the File's path attribute is
+            complemented with the working dir.
+        """
+        is_bytes = isinstance(content, bytes)
+        file_ = File(path="test.txt", is_bytes=is_bytes)
+
+        # ignore: mypy infers File[str] for file_, even if the content is bytes.
+        result = file_repo.stream_save(
+            file_, BytesIO(_to_bytes(content))  # type: ignore
+        )
+
+        assert file_repo_tester.content(file_) == content  # type: ignore
+        assert result.path == f"{file_repo.workdir}/test.txt"
+
+
+def _to_bytes(content: AnyStr) -> bytes:
+    """Return the content encoded as bytes."""
+    if isinstance(content, str):
+        return content.encode("utf-8")
+    return content
+
 
 def test_repo_raises_error_when_loading_unexistent_file(
     file_repo: FileRepository[AnyStr],
@@ -136,3 +213,21 @@ class TestLocalFileRepository:
 
         assert result.workdir == workdir
         assert os.path.exists(result.workdir)
+
+    def test_fix_path_prepends_workdir_if_path_doesnt_start_with_it(
+        self, tmp_path: Path
+    ) -> None:
+        """
+        Given: A repository and a File whose path contains the workdir but doesn't
+            start with it
+        When: fix_path is called
+        Then: The workdir is prepended to the path
+        """
+        workdir = str(tmp_path)
+        repo = LocalFileRepository(workdir=workdir)
+        file_ = File(path=f"backup{workdir}/test.txt")
+
+        result = repo.fix_path(file_)
+
+        assert result.path == f"{workdir}/backup{workdir}/test.txt"
+        assert repo.fix_path(result).path == f"{workdir}/backup{workdir}/test.txt"
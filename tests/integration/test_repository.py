@@ -4,29 +4,34 @@ The tests are all the same for all the repositories. If you want to add a new on
 add them to the cases.
 """
 
+import datetime
 import logging
 import os
 from pathlib import Path
-from typing import Any, List
+from sqlite3 import OperationalError, ProgrammingError
+from typing import Any, List, Tuple
 
 import pytest
 from _pytest.logging import LogCaptureFixture
 from pydantic import ValidationError
 from tests.cases.entities import AuthorFactory, BookFactory, GenreFactory
 from tests.cases.model import Book
+from tinydb import TinyDB
 
 from repository_orm import (
     AutoIncrementError,
     EntityNotFoundError,
+    PypikaRepository,
     Repository,
     TinyDBRepository,
 )
+from repository_orm.adapters.data.pypika import _regexp_to_like
 from repository_orm.adapters.data.tinydb import _regexp_in_list
 from repository_orm.exceptions import TooManyEntitiesError
 
 from ..cases import Entity, RepositoryTester
 from ..cases.entities import ListEntityFactory
-from ..cases.model import Author, BoolEntity, Genre, ListEntity
+from ..cases.model import Author, BoolEntity, Color, EnumEntity, Genre, ListEntity
 
 
 class TestDBConnection:
@@ -684,6 +689,45 @@ class TestSearch:
 
         assert result == [author]
 
+    def test_repository_search_returns_updated_entities(
+        self,
+        repo: Repository,
+    ) -> None:
+        """
+        Given: An entity that was found by the value of an attribute
+        When: The attribute is changed and we search by the new value
+        Then: The updated entity is found, and it's no longer found by the old value
+        """
+        book = Book(id_=1, name="Book", rating=3)
+        repo.add(book)
+        repo.commit()
+        assert repo.search({"rating": 3}, Book) == [book]
+        book.rating = 5
+        repo.add(book)
+        repo.commit()
+
+        result = repo.search({"rating": 5}, Book)
+
+        assert result == [book]
+        assert repo.search({"rating": 3}, Book) == []
+
+    def test_repository_search_skips_entities_without_the_attribute(
+        self,
+        repo: Repository,
+    ) -> None:
+        """
+        Given: Two entities, one of them without the searched attribute value
+        When: we search by a regular expression on that attribute
+        Then: only the entity with a matching value is returned
+        """
+        book = Book(id_=1, name="Book", summary="A summary")
+        repo.add([book, Book(id_=2, name="Book without summary")])
+        repo.commit()
+
+        result = repo.search({"summary": r"^a s.mmary"}, Book)
+
+        assert result == [book]
+
     # W0613: the fixture is used to create the data
     def test_repository_search_returns_empty_list_if_type_doesnt_match(
         self,
@@ -987,6 +1031,95 @@ def test_repository_next_id_raise_error_if_entity_has_str_id(
         repo.next_id(inserted_str_entity)
 
 
+def test_pypika_stores_enum_attributes(repo_pypika: PypikaRepository) -> None:
+    """
+    Given: An entity with an Enum attribute
+    When: It's added and committed to the repository
+    Then: The entity is read back with the same Enum value
+    """
+    entity = EnumEntity(id_=1, name="Name", color=Color.BLUE)
+    repo_pypika.add(entity)
+
+    repo_pypika.commit()  # act
+
+    assert repo_pypika.all(EnumEntity) == [entity]
+
+
+def test_pypika_gets_entities_by_enum_attributes(
+    repo_pypika: PypikaRepository,
+) -> None:
+    """
+    Given: A repository with entities with different Enum attribute values
+    When: get is called with an Enum value of that attribute
+    Then: The entity with that value is returned
+    """
+    entity = EnumEntity(id_=1, name="Name", color=Color.BLUE)
+    repo_pypika.add(entity)
+    repo_pypika.add(EnumEntity(id_=2, name="Other", color=Color.RED))
+    repo_pypika.commit()
+
+    # ignore: get accepts the values of any attribute, not only ids.
+    result = repo_pypika.get(Color.BLUE, EnumEntity, attribute="color")  # type: ignore
+
+    assert result == entity
+
+
+def test_pypika_searches_by_enum_attributes(repo_pypika: PypikaRepository) -> None:
+    """
+    Given: A repository with entities with different Enum attribute values
+    When: search is called with an Enum value of that attribute
+    Then: Only the entities with that value are returned
+    """
+    entity = EnumEntity(id_=1, name="Name", color=Color.BLUE)
+    repo_pypika.add(entity)
+    repo_pypika.add(EnumEntity(id_=2, name="Other", color=Color.RED))
+    repo_pypika.commit()
+
+    # ignore: search accepts the values of any attribute, not only ids.
+    result = repo_pypika.search({"color": Color.BLUE}, EnumEntity)  # type: ignore
+
+    assert result == [entity]
+
+
+def test_pypika_raises_error_on_add_if_attribute_is_not_supported(
+    repo_pypika: PypikaRepository,
+) -> None:
+    """
+    Given: A repository with a staged entity
+    When: An entity with an attribute that sqlite can't store is added
+    Then: The error is raised when adding it, and the staged entity can be committed
+    """
+    author = Author(id_="author", name="Name")
+    repo_pypika.add(author)
+
+    with pytest.raises(ProgrammingError, match="attribute elements"):
+        repo_pypika.add(ListEntity(id_=1, name="Name", elements=["element"]))
+
+    repo_pypika.commit()
+    assert repo_pypika.all(Author) == [author]
+
+
+def test_pypika_failed_commit_keeps_the_staged_entities(
+    repo_pypika: PypikaRepository,
+) -> None:
+    """
+    Given: Staged entities, one of them of a model without table
+    When: The commit fails
+    Then: None of the staged entities is written, and the next commit fails too
+        instead of persisting part of them.
+    """
+    repo_pypika.add(Author(id_="first", name="Name"))
+    repo_pypika.add(Entity(id_=1, name="Entity without table"))
+    repo_pypika.add(Author(id_="last", name="Name"))
+
+    with pytest.raises(OperationalError, match="no such table"):
+        repo_pypika.commit()
+
+    assert repo_pypika.cursor.execute("SELECT id FROM author").fetchall() == []
+    with pytest.raises(OperationalError, match="no such table"):
+        repo_pypika.commit()
+
+
 def test_tinydb_raises_error_if_wrong_model_data(
     repo_tinydb: TinyDBRepository, caplog: LogCaptureFixture
 ) -> None:
@@ -1015,6 +1148,71 @@ def test_tinydb_raises_error_if_wrong_model_data(
     ) in caplog.record_tuples
 
 
+def test_tinydb_trusted_load_skips_model_validation(
+    db_tinydb: Tuple[str, TinyDB],
+) -> None:
+    """
+    Given: A tinydb repository initialized with trusted_load and data that doesn't
+        match the model.
+    When: Get is called
+    Then: The entity is built without validating the data.
+    """
+    repo = TinyDBRepository(database_url=db_tinydb[0], trusted_load=True)
+    repo.db_.insert({"id_": 1, "model_type_": "entity"})
+
+    result = repo.get(1, Entity)
+
+    assert result.id_ == 1
+    assert "name" not in result.dict()
+    assert "model_type_" not in result.dict()
+    repo.close()
+
+
+def test_tinydb_trusted_load_keeps_the_attribute_types(
+    db_tinydb: Tuple[str, TinyDB],
+) -> None:
+    """
+    Given: A tinydb repository initialized with trusted_load and a stored entity
+        with a datetime attribute.
+    When: Get is called
+    Then: The loaded entity is equal to the stored one, with the same types.
+    """
+    repo = TinyDBRepository(database_url=db_tinydb[0], trusted_load=True)
+    book = BookFactory.build(released=datetime.datetime(2020, 1, 1, 10, 30))
+    repo.add(book)
+    repo.commit()
+
+    result = repo.get(book.id_, Book)
+
+    assert result == book
+    assert isinstance(result.released, datetime.datetime)
+    repo.close()
+
+
+def test_tinydb_trusted_load_entities_can_be_merged(
+    db_tinydb: Tuple[str, TinyDB],
+) -> None:
+    """
+    Given: A tinydb repository initialized with trusted_load and a stored entity
+    When: The entity is modified and added with merge
+    Then: The stored entity is updated
+    """
+    repo = TinyDBRepository(database_url=db_tinydb[0], trusted_load=True)
+    book = BookFactory.build()
+    repo.add(book)
+    repo.commit()
+    loaded_book = repo.get(book.id_, Book)
+    loaded_book.name = "new name"
+    repo.add(loaded_book, merge=True)
+
+    repo.commit()  # act
+
+    result = repo.get(book.id_, Book)
+    assert result.name == "new name"
+    assert result.defined_values == {}
+    repo.close()
+
+
 def test_regexp_in_list_handles_none_as_argument() -> None:
     """
     Given: Nothing
@@ -1027,3 +1225,31 @@ def test_regexp_in_list_handles_none_as_argument() -> None:
     result = _regexp_in_list(None, "test")
 
     assert not result
+
+
+@pytest.mark.parametrize(
+    ("expression", "like_pattern"),
+    [
+        ("name", "%name%"),
+        ("^name", "name%"),
+        ("name$", "%name"),
+        ("^name$", "name"),
+        ("^name.*", "name%"),
+        ("na.e", None),
+        ("na_e", None),
+        ("námé", None),
+    ],
+)
+def test_regexp_to_like_translates_only_literal_expressions(
+    expression: str, like_pattern: str
+) -> None:
+    """
+    Given: A regular expression
+    When: _regexp_to_like is called with it
+    Then: The equivalent LIKE pattern is returned if the expression is literal
+
+    Otherwise the search needs to use the REGEXP function.
+    """
+    result = _regexp_to_like(expression)
+
+    assert result == like_pattern
@@ -92,4 +92,14 @@ steps = [
         "PRIMARY KEY (id))",
         "DROP TABLE listentity",
     ),
+    step(
+        "CREATE TABLE enumentity ("
+        "id INT, "
+        "name VARCHAR(20), "
+        "state VARCHAR(20), "
+        "active BOOL, "
+        "color VARCHAR(20), "
+        "PRIMARY KEY (id))",
+        "DROP TABLE enumentity",
+    ),
 ]
@@ -68,6 +68,37 @@ class TestCompare:
 
         assert result
 
+    def test_equal_entities_of_the_same_model(self) -> None:
+        """Entities of the same model with the same attributes are equal."""
+        entity = BookFactory.build()
+        other = entity.copy()
+
+        result = entity == other
+
+        assert result
+
+    def test_entities_with_different_attributes_are_not_equal(self) -> None:
+        """Entities of the same model are compared by all their attributes."""
+        entity = BookFactory.build()
+        other = entity.copy()
+        other.name = "other name"
+
+        result = entity == other
+
+        assert not result
+
+    def test_entities_of_different_models_are_not_equal(self) -> None:
+        """Entities of different models are not equal even if their attributes are."""
+
+        class OtherEntity(Entity):
+            """Model with the same attributes as Entity."""
+
+        entity = Entity(id_=1)
+
+        result = entity == OtherEntity(id_=1)
+
+        assert not result
+
 
 class TestHash:
     """Test the hashing of entities."""
@@ -82,7 +113,7 @@ class TestHash:
 
         result = entity.__hash__()
 
-        assert result == hash("Entity-1")
+        assert result == hash(("Entity", 1))
 
 
 class TestCopy:
@@ -222,3 +253,24 @@ class TestMerge:
         original.merge(other)  # act
 
         assert original.rating == original_rating
+
+
+class TestConstruct:
+    """Test the creation of entities without validation."""
+
+    def test_construct_initializes_the_defined_values(self) -> None:
+        """
+        Given: Nothing
+        When: An entity is created with construct
+        Then: The defined values are the ones used to build the entity, and the
+            attributes can be set and merged.
+        """
+        result = Book.construct(id_=1, name="name")
+
+        result.name = "new name"
+        result.merge(Book(id_=1, name="new name", summary="summary"))
+        assert result.defined_values == {
+            "id_": 1,
+            "name": "new name",
+            "summary": "summary",
+        }
@@ -45,6 +45,22 @@ def test_file_extension() -> None:
     assert result == "txt"
 
 
+def test_file_path_parts_follow_the_path_changes() -> None:
+    """
+    Given: A File object whose path parts have been read
+    When: the path is changed
+    Then: the path parts of the new path are returned
+    """
+    file_ = File(path="/tmp/file.txt")
+    assert file_.basename == "file.txt"
+
+    file_.path = "/home/user/image.png"  # act
+
+    assert file_.dirname == "/home/user"
+    assert file_.basename == "image.png"
+    assert file_.extension == "png"
+
+
 def test_file_content() -> None:
     """
     Given: A File object with the content loaded.
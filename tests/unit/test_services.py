@@ -1,6 +1,8 @@
 """Tests the service layer."""
 
 import sqlite3
+import subprocess  # noqa: S404
+import sys
 from typing import Tuple
 
 import pytest
@@ -73,6 +75,33 @@ class TestLoadRepository:
         with pytest.raises(ValueError, match="Database URL: .* not recognized."):
             load_repository(database_url="inexistent://path/to/file.db")
 
+    def test_load_repository_only_checks_the_url_protocol(self) -> None:
+        """
+        Given: Nothing
+        When: load_repository is called with an url that contains a known protocol
+            after an unknown one
+        Then: An error is raised
+        """
+        with pytest.raises(ValueError, match="Database URL: .* not recognized."):
+            load_repository(database_url="inexistent://fake://path/to/file.db")
+
+    def test_load_repository_only_imports_the_used_backend(self) -> None:
+        """
+        Given: A new python interpreter
+        When: The library is imported and a fake repository is loaded
+        Then: The modules of the other database backends are not imported
+        """
+        code = (
+            "import sys; from repository_orm import load_repository; "
+            "load_repository('fake://'); "
+            "assert 'repository_orm.adapters.data.pypika' not in sys.modules; "
+            "assert 'repository_orm.adapters.data.tinydb' not in sys.modules"
+        )
+
+        result = subprocess.run([sys.executable, "-c", code], check=False)  # noqa
+
+        assert result.returncode == 0
+
 
 class TestLoadFileRepository:
     """Test the implementation of the load_file_repository service."""